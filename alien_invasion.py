@@ -1,261 +1,562 @@
-import sys
-from time import sleep #We import the sleep() function from the time module in the Python standard library, so we can pause the game for a moment when the ship is hit. 
-
-import pygame
-
-from settings import Settings
-from ship import Ship
-from bullet import Bullet
-from alien import Alien
-from game_stats import GameStats
-from scoreboard import Scoreboard
-from button import Button
-
-
-class AlienInvasion:
-    """Overall class to manage game assets and behaviour"""
-
-    def __init__(self): #Constructor method of Class. Used to initialize the object's attributes and perform any necessary setup or configuration. The self parameter refers to the instance of the class that is being created and allows you to access and modify its attributes and methods
-        """Initialize the game and create game resources"""
-        pygame.init() #initializes all the modules required for Pygame to work properly. It initializes various aspects of the game, such as the display, sound, and joystick, and prepares them for use. By calling pygame.init() at the beginning of the class's constructor, it ensures that all the necessary Pygame modules are initialized before setting up the game resources and creating the game window.
-        self.clock = pygame.time.Clock()
-        self.settings = Settings()
-
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN) #When creating the screen surface, we pass a size of (0, 0) and the parameter pygame.FULLSCREEN. This tells Pygame to figure out a window size that will fill the screen.
-        self.settings.screen_width = self.screen.get_rect().width #Because we don’t know the width and height of the screen ahead of time, we update these settings after the screen is created
-        self.settings.screen_height = self.screen.get_rect().height
-        pygame.display.set_caption("Alien Invasion")
-
-        # Create an instance to store game statistics,
-        #   and create a scoreboard.
-        self.stats = GameStats(self)
-        self.sb = Scoreboard(self)
-
-        self.ship = Ship(self) #Make instance of Ship after screen has been created. Ship class has two arguements (self, ai_game). So in that case, we need to provide an attribute for ai_game. I think using 'self' in this case means that an instance of AlienInvasion will be provided as the ai_game arguement. 
-        self.bullets = pygame.sprite.Group() #create the group that holds the bullets
-        self.aliens = pygame.sprite.Group()
-
-        self._create_fleet()
-
-        # Start Alien Invasion in an active state.
-        self.game_active = False
-
-        # Make the Play button.
-        self.play_button = Button(self, "Play") #"Play" will be the msg arguement for Button. I think the current game instance will be (ai_game) (self = ai_game, "play" = msg)
-
-    
-    def run_game(self):
-        """Start the main loop for the game"""
-        while True:
-            self._check_events()
-            
-            if self.game_active:
-                self.ship.update() #The ship’s position will be updated AFTER we’ve checked for keyboard events and BEFORE we update the screen. This allows the ship’s position to be updated in response to player input and ensures the updated position will be used when drawing the ship to the screen.
-                self._update_bullets()
-                self._update_aliens() #We update the aliens’ positions after the bullets have been updated, because we’ll soon be checking to see whether any bullets hit any aliens.
-
-            self._update_screen()
-            self.clock.tick(60) #Used to control the frame rate of te game (60FPS). By calling self.clock.tick(60), the clock object limits the game loop to run at a maximum of 60 iterations per second. The argument 60 passed to tick() represents the desired frame rate in FPS. It instructs the clock object to delay the loop execution if necessary to maintain the specified frame rate. If the loop iteration takes less time than expected for a given frame rate, tick() will introduce a delay to keep the loop running at a consistent pace.
-
-    def _check_events(self): #A helper method does work inside a class but isn’t meant to be used by code outside the class. In Python, a single leading underscore indicates a helper method.
-        """Respond to keypresses and mouse events."""
-        for event in pygame.event.get(): #pygame.event.get() retrieves a list of events that have occurred since the last time this function was called. The loop iterates over each event in the list obtained in the previous step
-                if event.type == pygame.QUIT:
-                    sys.exit() #If the event type is pygame.QUIT, it means the user is trying to close the window. In response to this event, the code calls sys.exit(). This function is part of the sys module and is used to exit the Python program, terminating the application.
-                elif event.type == pygame.KEYDOWN: #If pygame detects a keydown event
-                    self._check_keydown_events(event)
-                elif event.type == pygame.KEYUP: #When right key is released, set moving flag = False. 
-                    self._check_keyup_events(event)
-                elif event.type == pygame.MOUSEBUTTONDOWN: #Pygame detects a MOUSEBUTTONDOWN event when the player clicks anywhere on the screen, but we want to restrict our game to respond to mouse clicks only on the Play button.
-                    mouse_pos = pygame.mouse.get_pos() #To accomplish this, we use pygame.mouse.get_pos(), which returns a tuple containing the mouse cursor’s x- and y-coordinates when the mouse button is clicked
-                    self._check_play_button(mouse_pos) #We send these values to the new method _check_play_button()
-
-    def _check_play_button(self, mouse_pos):
-        """Start a new game when the player clicks Play."""
-        button_clicked = self.play_button.rect.collidepoint(mouse_pos) #We use the rect method collidepoint() to check whether the point of the mouse click overlaps the region defined by the Play button’s rect. If so, we set game_active to True, and the game begins! The flag button_clicked stores a True or False value , and the game will restart only if Play is clicked and the game is not currently active.
-        if button_clicked and not self.game_active:
-            # Reset the game settings.
-            self.settings.initialize_dynamic_settings() #Need to reset speed everytime the game starts again.
-            # Reset the game statistics.
-            self.stats.reset_stats() #We reset the game statistics, which gives the player three new ships. 
-            self.sb.prep_score() #We call prep_score() after resetting the game stats when starting a new game. This preps the scoreboard with a score of 0.
-            self.sb.prep_level() #We call prep_level() when the player clicks the Play button to ensure the level image updates properly at the start of a new game.
-            self.sb.prep_ships() #To show the player how many ships they have to start with, we call prep_ships() when a new game starts.
-            self.game_active = True
-
-            #Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
-            self.aliens.empty()
-
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-
-            #Hide the mouse cursor
-            pygame.mouse.set_visible(False)
-                    
-    def _check_keydown_events(self,event):
-        """Respond to keypresses."""
-        if event.key == pygame.K_RIGHT: #if the key pressed is the right arrow key
-            self.ship.moving_right = True #Set moving flag = True
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = True
-        elif event.key == pygame.K_q: #If user presses Q, game will close. 
-            sys.exit()
-        elif event.key == pygame.K_SPACE:
-            self._fire_bullet()
-
-    def _check_keyup_events(self,event):
-        """Respond to key releases."""
-        if event.key == pygame.K_RIGHT:
-            self.ship.moving_right = False 
-        elif event.key == pygame.K_LEFT:
-            self.ship.moving_left = False
-
-    def _fire_bullet(self):
-        """Create a new bullet and add it to the bullets group."""
-        if len(self.bullets) < self.settings.bullets_allowed:
-            new_bullet = Bullet(self) #creates a new instance of the Bullet class by calling its constructor. 
-            self.bullets.add(new_bullet) #self.bullets refers to a group (or container) of bullet objects. The line adds the newly created new_bullet object to this group using the add() method. By adding the bullet to the group, it becomes part of the collection of bullets that will be updated and drawn in the game.
-
-    def _update_bullets(self):
-        """Update position of bullets and get rid of old bullets."""
-        self.bullets.update() #When you call update() on a group, the group automatically calls update() for each sprite in the group. The line self.bullets.update() calls bullet.update() for each bullet we place in the group bullets
-        # Get rid of bullets that have disappeared.
-
-        for bullet in self.bullets.copy(): #When you use a for loop with a list (or a group in Pygame), Python expects that the list will stay the same length as long as the loop is running. That means you can’t remove items from a list or group within a for loop, so we have to loop over a copy of the group. We use the copy() method to set up the for loop ❶, which leaves us free to modify the original bullets group inside the loop.
-            if bullet.rect.bottom <= 0: #If bottom of bullet has just moved off the top of the screen.
-                self.bullets.remove(bullet)
-
-        self._check_bullet_alien_collisions()
-
-
-    def _check_bullet_alien_collisions(self):
-        """Respond to bullet-alien collisions."""
-        # Remove any bullets and aliens that have collided.
-        collisions = pygame.sprite.groupcollide(self.bullets, self.aliens, True, True) #compares the positions of all the bullets in self.bullets and all the aliens in self.aliens, and identifies any that overlap. Whenever the rects of a bullet and alien overlap, groupcollide() adds a key-value pair to the dictionary it returns. The two True arguments tell Pygame to delete the bullets and aliens that have collided. E.g. if you wanted a bullet to not disappear and keep killing aliens until the end of the screen, you would use "False, True" arguements. 
-
-        if collisions: #When a bullet hits an alien, Pygame returns a collisions dictionary. We check whether the dictionary exists, and if it does, the alien’s value is added to the score.
-            for aliens in collisions.values(): #Each value in the dictionary is a list of aliens that were hit by a single bullet. The key in the dictionary corresponds to the bullet that caused the collisions. E.g. the dictionary would look like below:
-                #collisions = {
-                # bullet1: [alien1, alien2, alien3], bullet1 caused collisions with alien1, alien2, and alien3.
-                # bullet2: [alien4, alien5],
-                # bullet3: [alien6]
-                #}
-                self.stats.score += self.settings.alien_points * len(aliens) #We multiply the value of each alien by the number of aliens in each list and add this amount to the current score. 
-            self.stats.score += self.settings.alien_points
-            self.sb.prep_score() #We then call prep_score() to create a new image for the updated score.
-            self.sb.check_high_score() #We need to call check_high_score() each time an alien is hit after updating the score
-
-        if not self.aliens: #Executes if alien group is empty
-            # Destroy existing bullets and create new fleet.
-            self.bullets.empty()
-            self._create_fleet()
-            self.settings.increase_speed() #Increase speed once player has cleared alien fleet. 
-
-            # Increase level.
-            self.stats.level += 1
-            self.sb.prep_level() #If a fleet is destroyed, we increment the value of stats.level and call prep_level() to make sure the new level displays correctly
-
-    def _ship_hit(self):
-        """Respond to the ship being hit by an alien."""
-        if self.stats.ships_left > 0:
-            self.stats.ships_left -= 1 ## Decrement ships_left
-            self.sb.prep_ships() #and update scoreboard. We call prep_ships() after decreasing the value of ships_left, so the correct number of remaining ships displays each time a ship is destroyed.
-            # Get rid of any remaining bullets and aliens.
-            self.bullets.empty()
-            self.aliens.empty()
-
-            # Create a new fleet and center the ship.
-            self._create_fleet()
-            self.ship.center_ship()
-
-            #pauses program execution for half a second, long enough for the player to see that the alien has hit the ship.
-            sleep(0.5)
-        else:
-            self.game_active = False
-            pygame.mouse.set_visible(True)
-
-
-    def _update_aliens(self):
-        """Update the position of all aliens in the fleet"""
-        self._check_fleet_edges()
-        self.aliens.update()
-
-        # Look for alien-ship collisions.
-        if pygame.sprite.spritecollideany(self.ship, self.aliens): #two arguments: a sprite and a group. looks for any member of the group that has collided with the sprite and stops looping through the group as soon as it finds one member that has collided with the sprite. loops through the group aliens and returns the first alien it finds that has collided with ship
-            self._ship_hit()
-        
-        # Look for aliens hitting the bottom of the screen.
-        self._check_aliens_bottom()
-
-    def _create_fleet(self):
-        """Create the fleet of aliens."""
-        # Create an alien and keep adding aliens until there's no room left.Spacing between aliens is one alien width.
-        # Spacing between aliens is one alien width and one alien height.
-        alien = Alien(self) #Create new instance of Alien class called alien. Represents a single alien in the fleet. 
-        alien_width, alien_height = alien.rect.size #A rect’s size attribute is a tuple containing its width and height respectively
-        
-        current_x, current_y = alien_width, alien_height #get the alien’s width from the first alien we created, and then define a variable called current_x
-        while current_y < (self.settings.screen_height - 3 * alien_height):
-            while current_x < (self.settings.screen_width - 2 * alien_width): #continues until the value of current_x is less than the screen width minus twice the alien width. This condition ensures that the fleet of aliens is created within the game screen boundaries, leaving enough space for each alien.
-                self._create_alien(current_x, current_y)
-                current_x += 2 * alien_width #We add two alien widths to the horizontal position, to move past the alien we just added and to leave some space between the aliens as well. Python will re-evaluate the condition at the start of the while loop and decide if there’s room for another alien. When there’s no room left, the loop will end, and we should have a full row of aliens.
-
-            # Finished a row; reset x value, and increment y value.
-            current_x = alien_width
-            current_y += 2 * alien_height
-
-        self.aliens.add(alien)
-
-    def _create_alien(self, x_position, y_position):
-        """Create an alien and place it in the row."""
-        new_alien = Alien(self) # Create new instance of alien class called new_alien
-        new_alien.x = x_position
-        new_alien.rect.x = x_position
-        new_alien.rect.y = y_position
-        self.aliens.add(new_alien)
-
-    def _check_aliens_bottom(self):
-        """Check if any aliens have reached the bottom of the screen."""
-        for alien in self.aliens.sprites():
-            if alien.rect.bottom >= self.settings.screen_height:
-                # Treat this the same as if the ship got hit.
-                self._ship_hit()
-                break
-
-    def _check_fleet_edges(self):
-        """Respond appropriately if any aliens have reached an edge."""
-        for alien in self.aliens.sprites():
-            if alien.check_edges(): #If check_edges() returns True, we know an alien is at an edge and the whole fleet needs to change direction
-                self._change_fleet_direction()
-                break
-
-    def _change_fleet_direction(self): #loop through all the aliens and drop each one using the setting fleet_drop_speed
-        """Drop the entire fleet and change the fleet's direction."""
-        for alien in self.aliens.sprites():
-            alien.rect.y += self.settings.fleet_drop_speed
-        self.settings.fleet_direction *= -1 #then we change the value of fleet_direction by multiplying its current value by −1. The line that changes the fleet’s direction isn’t part of the for loop. We want to change each alien’s vertical position, but we only want to change the direction of the fleet once
-
-    def _update_screen(self):
-        """Update images on the screen and flip to the new screen"""
-        self.screen.fill(self.settings.bg_colour)
-        for bullet in self.bullets.sprites(): #iterates over each bullet object in the self.bullets group. The sprites() method is called on the self.bullets group, which returns a list of all the sprite objects (bullets) contained within the group
-            bullet.draw_bullet() 
-        self.ship.blitme() #Draw ship on screen
-        self.aliens.draw(self.screen) #used to draw all the alien objects in the self.aliens group onto the game screen (self.screen). The draw() method is a built-in method provided by the pygame.sprite.Group class. In this case, self.aliens.draw() is called with the argument self.screen, which represents the game screen surface. By calling self.aliens.draw(self.screen), the draw() method iterates over each alien object in the self.aliens group and renders or blits their respective images onto the game screen.
-
-        # Draw the score information.
-        self.sb.show_score()
-
-        # Draw the play button if the game is inactive.
-        if not self.game_active: #To make the Play button visible above all other elements on the screen, we draw it after all the other elements have been drawn but before flipping to a new screen.
-            self.play_button.draw_button()
-    
-        pygame.display.flip() #Pygame uses two buffers: a front buffer and a back buffer. The front buffer is the one displayed on the screen, while the back buffer is where changes are made before being displayed. When pygame.display.flip() is called, the contents of the back buffer are swapped with the front buffer, making the updated frame visible to the user.
-
-
-if __name__ == '__main__': #checks whether the current module is being run as the main program or if it is being imported as a module. When a Python module is run directly as the main     program (i.e., it is not imported by another module), the special variable __name__ is set to '__main__'. if a module is imported by another module, the value of __name__ is set to the module's name.
-    #Make a game instance and run the game.
-    ai = AlienInvasion()
-    ai.run_game()
+import sys
+import os
+import random
+import argparse
+from time import perf_counter
+
+_imports_started = perf_counter() #For the startup breakdown: everything imported below counts as import time.
+
+import pygame
+
+from settings import Settings
+from assets import AssetCache
+from atlas import SpriteAtlas
+from ship import Ship
+from bullet import Bullet
+from alien import Alien
+from alien_shots import AlienShots
+from fleet_engine import VectorFleet
+from spatial_hash import SpatialHash
+from waves import WaveScheduler
+from pool import SpritePool
+from game_stats import GameStats
+from score_store import ScoreStore
+from scoreboard import Scoreboard
+from button import Button
+from renderer import DirtyRenderer
+from profiler import FrameProfiler
+from replay import InputRecorder, KEY_DOWN, KEY_UP, PLAY_CLICK
+
+IMPORT_SECONDS = perf_counter() - _imports_started
+
+
+class AlienInvasion:
+    """Overall class to manage game assets and behaviour"""
+
+    def __init__(self, headless=False, seed=None, screen_size=None, players=1, settings=None): #Constructor method of Class. Used to initialize the object's attributes and perform any necessary setup or configuration. The self parameter refers to the instance of the class that is being created and allows you to access and modify its attributes and methods
+        """Initialize the game and create game resources; players above 1 adds partner ships for co-op (see coop.py), and settings replaces the defaults."""
+        self.headless = headless #A headless game never opens a real window, so the simulation can run on a machine without a display and as fast as the CPU allows.
+        if self.headless:
+            os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') #SDL's dummy video driver gives us Surfaces to draw on without a window. It has to be chosen before pygame.init().
+        self.startup_times = [('imports', IMPORT_SECONDS)] #(stage, seconds) for each step of startup.
+        self._stage_start = perf_counter()
+        # Only start the pygame modules the game uses. pygame.init() would also start audio and joysticks, which cost startup time and aren't used.
+        pygame.display.init()
+        pygame.font.init()
+        self.clock = pygame.time.Clock()
+        self.settings = settings or Settings() #A caller can pass Settings it has already adjusted, for things that have to be decided before startup.
+
+        if self.headless:
+            self.screen = pygame.display.set_mode(screen_size or (self.settings.screen_width, self.settings.screen_height)) #There's no monitor to fill, so use the size we were given or the one from Settings.
+        elif screen_size:
+            self.screen = pygame.display.set_mode(screen_size) #A window of a set size, e.g. a co-op client matching the server's screen.
+        else:
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN) #When creating the screen surface, we pass a size of (0, 0) and the parameter pygame.FULLSCREEN. This tells Pygame to figure out a window size that will fill the screen.
+        self.settings.screen_width = self.screen.get_rect().width #Because we don’t know the width and height of the screen ahead of time, we update these settings after the screen is created
+        self.settings.screen_height = self.screen.get_rect().height
+        pygame.display.set_caption("Alien Invasion")
+        self._mark_startup('display')
+
+        self.seed = seed
+        self.rng = random.Random(seed) #All of the game's randomness comes from this generator, so a given seed always plays out the same game.
+        self.frame = 0 #Number of fixed timesteps the game has run.
+        self.hit_pause = 0 #Timesteps left in the pause after the ship is hit.
+        self.moved = False #True if the last timestep moved the sprites, so frames drawn before the next one can interpolate.
+
+        # Open the saved high scores. They load on a background thread, and finished games are written there too, so the disk never holds up a frame.
+        self.score_store = None
+        if self.settings.persist_scores and not self.headless:
+            self.score_store = ScoreStore(self.settings.score_store_dir, self.settings.score_profile, self.settings.score_table_size)
+        self.saved_high_score_pending = self.score_store is not None #True until the best saved score has been shown; see _check_saved_high_score().
+
+        self.waves = WaveScheduler(self) #Reads the wave definitions: which fleets arrive at each level, and when.
+
+        # Read the fonts and images on a worker thread while a loading screen is shown, then convert them here, now that the screen's pixel format is known.
+        self.assets = AssetCache()
+        image_paths = [self.settings.ship_image] + self.waves.image_paths()
+        make_atlas = None
+        if self.settings.use_sprite_atlas:
+            display_size = self.screen.get_size()
+            make_atlas = lambda: SpriteAtlas(image_paths, display_size, self.settings) #Packs and scales the images, or loads the atlas built on an earlier launch.
+        self.assets.start_preload(image_paths, [(None, 48), (None, 24)], make_atlas)
+        if not self.headless:
+            self._show_loading_screen()
+        self.assets.finish_preload(image_paths)
+        self._mark_startup('assets')
+
+        # Create an instance to store game statistics,
+        #   and create a scoreboard.
+        self.stats = GameStats(self)
+        self.sb = Scoreboard(self)
+
+        self.ship = Ship(self) #Make instance of Ship after screen has been created. Ship class has two arguements (self, ai_game). So in that case, we need to provide an attribute for ai_game. I think using 'self' in this case means that an instance of AlienInvasion will be provided as the ai_game arguement. 
+        self.ships = [self.ship] #Every player's ship; self.ship is the local player's. Partners are driven over the network by coop.py.
+        for _ in range(players - 1):
+            partner = Ship(self)
+            partner.image = partner.image.copy()
+            partner.image.fill(self.settings.partner_ship_tint, special_flags=pygame.BLEND_MULT) #Tint partners so each player can tell which ship is theirs.
+            self.ships.append(partner)
+        self._center_ships()
+        self.bullets = pygame.sprite.Group() #create the group that holds the bullets
+        self.bullet_pool = SpritePool(lambda: Bullet(self)) #Bullets and aliens are recycled through pools instead of being built and thrown away.
+        self.alien_pool = SpritePool(lambda: Alien(self))
+        self.aliens = pygame.sprite.RenderUpdates() #A RenderUpdates group works just like a Group, but its draw() also reports which rects changed, which the dirty-rect renderer needs.
+        self.alien_shots = AlienShots(self) #The aliens' return fire lives in preallocated arrays, moved and checked against the ship in one batch per timestep.
+        self.fleet_engine = VectorFleet(self) if self.settings.fleet_backend == 'numpy' else None #With the numpy backend the fleet's positions live in arrays and are moved in one batch per frame.
+
+        self.spatial_hash = None
+        self.collision_grid = None #The spatial hash while the current wave uses it; see _fleets_changed().
+        if self.settings.collision_broadphase != 'none' and not self.fleet_engine: #The numpy backend tests collisions against its own arrays.
+            sizes = [self.assets.load_image(path).get_size() for path in self.waves.image_paths()]
+            self.spatial_hash = SpatialHash(max(width for width, _ in sizes), max(height for _, height in sizes)) #Cells the size of the biggest alien. Bullets and the ship only get checked against aliens in nearby cells instead of against the whole fleet.
+
+        self._create_fleet()
+
+        # Start Alien Invasion in an active state.
+        self.game_active = False
+
+        # Make the Play button.
+        self.play_button = Button(self, "Play") #"Play" will be the msg arguement for Button. I think the current game instance will be (ai_game) (self = ai_game, "play" = msg)
+
+        self.renderer = DirtyRenderer(self) #Used instead of the full fill-and-flip when settings.dirty_rendering is on.
+        self.pixels_touched = 0 #Pixels pushed to the display in the last frame, to compare the two render modes.
+
+        self.profiler = FrameProfiler(self) #Times each phase of the frame when settings.profile_frames or settings.show_profiler is on.
+        self.recorder = None #An InputRecorder while the session is being recorded.
+        self._mark_startup('game_objects')
+
+    def _mark_startup(self, stage):
+        """Record how long the startup stage that just finished took."""
+        now = perf_counter()
+        self.startup_times.append((stage, now - self._stage_start))
+        self._stage_start = now
+
+    def startup_report(self):
+        """Return the startup time breakdown as printable lines."""
+        total = sum(seconds for _, seconds in self.startup_times)
+        lines = [f"{stage:<14}{seconds * 1000:8.1f} ms" for stage, seconds in self.startup_times]
+        lines.append(f"{'total':<14}{total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+    def _show_loading_screen(self):
+        """Draw a progress bar until the preload thread is done. No fonts are needed, since they're still loading."""
+        bar = pygame.Rect(0, 0, self.screen.get_width() // 3, 20)
+        bar.center = self.screen.get_rect().center
+        while self.assets.preloading:
+            pygame.event.pump() #Keep the window responsive while we wait.
+            self.screen.fill(self.settings.bg_colour)
+            pygame.draw.rect(self.screen, (30, 30, 30), bar, 2)
+            done = self.assets.preload_done / max(1, self.assets.preload_total)
+            pygame.draw.rect(self.screen, (0, 135, 0), (bar.x, bar.y, int(bar.width * done), bar.height))
+            pygame.display.flip()
+            self.assets.wait_preload(1 / 30) #Redraw about 30 times a second, but stop waiting the moment loading is done.
+
+    
+    def run_game(self):
+        """Start the main loop for the game"""
+        # The simulation advances in fixed timesteps of 1/tick_rate seconds, however fast frames are drawn. Real time piles up in
+        #   accumulator; each frame runs as many whole timesteps as fit, then draws the sprites part of the way to the next one.
+        timestep = 1 / self.settings.tick_rate
+        accumulator = 0.0
+        previous = perf_counter()
+        while True:
+            now = perf_counter()
+            accumulator += now - previous
+            previous = now
+
+            self.profiler.begin_frame()
+            self._check_events()
+            self._check_saved_high_score()
+            self.profiler.lap('check_events')
+            ticks = 0
+            while accumulator >= timestep and ticks < self.settings.max_ticks_per_frame:
+                self.advance()
+                accumulator -= timestep
+                ticks += 1
+            if ticks == self.settings.max_ticks_per_frame:
+                accumulator = min(accumulator, timestep) #Too far behind (e.g. the window was dragged): drop the backlog instead of fast-forwarding through it.
+            self._update_screen(accumulator / timestep)
+            self.profiler.lap('update_screen')
+            self.profiler.end_frame()
+            self.clock.tick(self.settings.render_fps_cap) #Sleeps just enough to keep drawing at no more than render_fps_cap frames per second (0 means no cap). The simulation speed doesn't depend on this any more.
+
+    def run_headless(self, max_frames, policy=None):
+        """Play one game without rendering and return the final statistics."""
+        self.start_game()
+        end_frame = self.frame + max_frames
+        while self.game_active and self.frame < end_frame:
+            self.profiler.begin_frame()
+            if policy:
+                policy(self) #A policy stands in for the player: it sets the ship's moving flags and fires bullets, just like the key handlers do.
+            self.profiler.lap('check_events')
+            self.advance()
+            self.profiler.end_frame()
+        return self.stats
+
+    def advance(self):
+        """Advance the game by one fixed timestep."""
+        self.moved = False
+        if self.game_active:
+            if self.hit_pause:
+                self.hit_pause -= 1 #Hold everything still for a moment after the ship is hit, without blocking the loop.
+            else:
+                for ship in self.ships:
+                    ship.update() #The ship’s position will be updated AFTER we’ve checked for keyboard events and BEFORE we update the screen. This allows the ship’s position to be updated in response to player input and ensures the updated position will be used when drawing the ship to the screen.
+                self.profiler.lap('ship_update')
+                self._update_bullets()
+                self.profiler.lap('update_bullets')
+                self._check_bullet_alien_collisions() #Checked right after the bullets move, before the aliens do.
+                self.profiler.lap('bullet_alien_collisions')
+                self._update_aliens() #We update the aliens’ positions after the bullets have been updated, because we’ll soon be checking to see whether any bullets hit any aliens.
+                self.profiler.lap('update_aliens')
+                self._update_alien_shots()
+                self.profiler.lap('alien_shots')
+                self.moved = True
+        self.frame += 1
+
+    def _check_events(self): #A helper method does work inside a class but isn’t meant to be used by code outside the class. In Python, a single leading underscore indicates a helper method.
+        """Respond to keypresses and mouse events."""
+        for event in pygame.event.get(): #pygame.event.get() retrieves a list of events that have occurred since the last time this function was called. The loop iterates over each event in the list obtained in the previous step
+                if event.type == pygame.QUIT:
+                    self._quit() #If the event type is pygame.QUIT, it means the user is trying to close the window. In response to this event, the code calls sys.exit(). This function is part of the sys module and is used to exit the Python program, terminating the application.
+                elif event.type == pygame.KEYDOWN: #If pygame detects a keydown event
+                    if self.recorder:
+                        self.recorder.log(KEY_DOWN, event.key) #Log the input before handling it, so a recording that ends with Q still replays the Q.
+                    self._check_keydown_events(event)
+                elif event.type == pygame.KEYUP: #When right key is released, set moving flag = False. 
+                    if self.recorder:
+                        self.recorder.log(KEY_UP, event.key)
+                    self._check_keyup_events(event)
+                elif event.type == pygame.MOUSEBUTTONDOWN: #Pygame detects a MOUSEBUTTONDOWN event when the player clicks anywhere on the screen, but we want to restrict our game to respond to mouse clicks only on the Play button.
+                    mouse_pos = pygame.mouse.get_pos() #To accomplish this, we use pygame.mouse.get_pos(), which returns a tuple containing the mouse cursor’s x- and y-coordinates when the mouse button is clicked
+                    if self.recorder:
+                        self.recorder.log(PLAY_CLICK, *mouse_pos)
+                    self._check_play_button(mouse_pos) #We send these values to the new method _check_play_button()
+
+    def _check_play_button(self, mouse_pos):
+        """Start a new game when the player clicks Play."""
+        button_clicked = self.play_button.rect.collidepoint(mouse_pos) #We use the rect method collidepoint() to check whether the point of the mouse click overlaps the region defined by the Play button’s rect. If so, we set game_active to True, and the game begins! The flag button_clicked stores a True or False value , and the game will restart only if Play is clicked and the game is not currently active.
+        if button_clicked and not self.game_active:
+            self.start_game()
+
+    def _check_saved_high_score(self, wait=False):
+        """Show the best saved score once the score store's background thread has loaded it.
+
+        Without wait this only looks, so the frame loop never waits on the disk.
+        """
+        if not self.saved_high_score_pending:
+            return
+        saved = self.score_store.high_score() if wait else self.score_store.loaded_high_score()
+        if saved is None:
+            return
+        self.saved_high_score_pending = False
+        self.stats.high_score = max(self.stats.high_score, saved) #The scoreboard hears about the change and redraws it.
+
+    def start_game(self):
+        """Reset the settings and statistics and start a new game."""
+        self._check_saved_high_score(wait=True) #A game can't start without the record to beat.
+        # Reset the game settings.
+        self.settings.initialize_dynamic_settings() #Need to reset speed everytime the game starts again.
+        # Reset the game statistics.
+        self.stats.reset_stats() #We reset the game statistics, which gives the player three new ships. The scoreboard hears about the changes and redraws them before the next frame.
+        self.game_active = True
+
+        #Get rid of any remaining bullets and alien shots. _create_fleet() recycles the old aliens.
+        self.bullet_pool.release_all(self.bullets)
+        self.alien_shots.clear()
+
+        # Create a new fleet and center the ships.
+        self._create_fleet()
+        self._center_ships()
+
+        #Hide the mouse cursor
+        pygame.mouse.set_visible(False)
+                
+    def _check_keydown_events(self,event):
+        """Respond to keypresses."""
+        if event.key == pygame.K_RIGHT: #if the key pressed is the right arrow key
+            self.ship.moving_right = True #Set moving flag = True
+        elif event.key == pygame.K_LEFT:
+            self.ship.moving_left = True
+        elif event.key == pygame.K_q: #If user presses Q, game will close. 
+            self._quit()
+        elif event.key == pygame.K_SPACE:
+            self._fire_bullet()
+        elif event.key == pygame.K_F2: #F2 switches between full and dirty-rect rendering.
+            self.settings.dirty_rendering = not self.settings.dirty_rendering
+            self.renderer.invalidate()
+        elif event.key == pygame.K_F3: #F3 shows or hides the frame-time overlay.
+            self.settings.show_profiler = not self.settings.show_profiler
+            self.renderer.invalidate()
+
+    def record(self, path):
+        """Start logging every input to path so the session can be replayed."""
+        self.recorder = InputRecorder(path, self)
+
+    def _quit(self):
+        """Save the frame profile and recording if they were asked for, then exit."""
+        if self.recorder:
+            self.recorder.close()
+        if self.score_store:
+            if self.game_active: #Quitting mid-game still counts the score so far.
+                self._save_score()
+            self.score_store.close() #Waits for the last scores to reach the disk.
+        if self.settings.profile_frames and self.settings.profile_dump_path:
+            self.profiler.dump(self.settings.profile_dump_path)
+        sys.exit()
+
+    def _check_keyup_events(self,event):
+        """Respond to key releases."""
+        if event.key == pygame.K_RIGHT:
+            self.ship.moving_right = False 
+        elif event.key == pygame.K_LEFT:
+            self.ship.moving_left = False
+
+    def _fire_bullet(self, ship=None):
+        """Create a new bullet from ship (the local player's by default) and add it to the bullets group."""
+        if ship is None:
+            ship = self.ship
+        if sum(bullet.ship is ship for bullet in self.bullets) < self.settings.bullets_allowed: #Each ship has its own bullets_allowed.
+            new_bullet = self.bullet_pool.acquire(ship) #takes a used bullet from the pool and moves it to the ship, only building a new Bullet when the pool is empty. 
+            self.bullets.add(new_bullet) #self.bullets refers to a group (or container) of bullet objects. The line adds the newly created new_bullet object to this group using the add() method. By adding the bullet to the group, it becomes part of the collection of bullets that will be updated and drawn in the game.
+
+    def _update_bullets(self):
+        """Update position of bullets and get rid of old bullets."""
+        self.bullets.update() #When you call update() on a group, the group automatically calls update() for each sprite in the group. The line self.bullets.update() calls bullet.update() for each bullet we place in the group bullets
+        # Bullets that move off the top of the screen release themselves back to the pool from Bullet.update(), so there's no second pass over a copy of the group.
+
+    def _check_bullet_alien_collisions(self):
+        """Respond to bullet-alien collisions."""
+        # Remove any bullets and aliens that have collided.
+        if self.fleet_engine:
+            collisions = self.fleet_engine.groupcollide(self.bullets) #Each bullet is tested against the whole fleet's arrays at once; the sprite rects aren't used.
+        elif self.collision_grid:
+            collisions = self.collision_grid.groupcollide(self.bullets, True, True) #Same result as the groupcollide() call below, but each bullet is only checked against aliens in the grid cells it touches.
+        else:
+            collisions = pygame.sprite.groupcollide(self.bullets, self.aliens, True, True) #compares the positions of all the bullets in self.bullets and all the aliens in self.aliens, and identifies any that overlap. Whenever the rects of a bullet and alien overlap, groupcollide() adds a key-value pair to the dictionary it returns. The two True arguments tell Pygame to delete the bullets and aliens that have collided. E.g. if you wanted a bullet to not disappear and keep killing aliens until the end of the screen, you would use "False, True" arguements. 
+
+        if collisions: #When a bullet hits an alien, Pygame returns a collisions dictionary. We check whether the dictionary exists, and if it does, the alien’s value is added to the score.
+            for bullet, aliens in collisions.items(): #Both have already been removed from their groups; put them back in their pools.
+                self.bullet_pool.release(bullet)
+                for alien in aliens:
+                    self.alien_pool.release(alien)
+            for aliens in collisions.values(): #Each value in the dictionary is a list of aliens that were hit by a single bullet. The key in the dictionary corresponds to the bullet that caused the collisions. E.g. the dictionary would look like below:
+                #collisions = {
+                # bullet1: [alien1, alien2, alien3], bullet1 caused collisions with alien1, alien2, and alien3.
+                # bullet2: [alien4, alien5],
+                # bullet3: [alien6]
+                #}
+                self.stats.score += sum(alien.fleet.points for alien in aliens) #We add up the value of each alien in each list (each fleet has its own points) and add this amount to the current score. 
+            self.stats.score += self.settings.alien_points #The scoreboard checks the high score on each change but redraws the score once, just before it's shown.
+
+        if not self.aliens and not self.waves.pending: #Executes if alien group is empty and no more fleets are due this wave
+            # Destroy existing bullets and alien shots.
+            self.bullet_pool.release_all(self.bullets)
+            self.alien_shots.clear()
+            self.settings.increase_speed() #Increase speed once player has cleared alien fleet. This comes before the new wave, because each fleet takes its speed from the settings when it arrives.
+
+            # Increase level.
+            self.stats.level += 1 #If a fleet is destroyed, we increment the value of stats.level; the scoreboard redraws the level before the next frame.
+            self._create_fleet() #Then start the next level's wave.
+
+    def _ship_hit(self):
+        """Respond to the ship being hit by an alien or an alien shot."""
+        if self.stats.ships_left > 0:
+            self.stats.ships_left -= 1 ## Decrement ships_left; the scoreboard shows one less ship on the next frame.
+            # Get rid of any remaining bullets and alien shots. _create_fleet() recycles the old aliens.
+            self.bullet_pool.release_all(self.bullets)
+            self.alien_shots.clear()
+
+            # Create a new fleet and center the ships.
+            self._create_fleet()
+            self._center_ships()
+
+            #pause the game for half a second, long enough for the player to see that the alien has hit the ship. Counting down timesteps instead of calling sleep() keeps the loop (and a headless simulation) running.
+            self.hit_pause = int(self.settings.hit_pause * self.settings.tick_rate)
+        else:
+            if self.game_active: #The ship and the bottom of the screen can both be hit on the last frame; only save the score once.
+                self._save_score()
+            self.game_active = False
+            pygame.mouse.set_visible(True)
+
+    def _save_score(self):
+        """Queue the finished game's score to be saved."""
+        if self.score_store and self.stats.score:
+            self.score_store.submit(self.stats.score, self.stats.level)
+
+
+    def _update_aliens(self):
+        """Update the position of all aliens in every fleet"""
+        if self.waves.update(): #A delayed fleet has just arrived.
+            self._fleets_changed()
+
+        if self.fleet_engine:
+            self.fleet_engine.update() #Moves, edge-checks and drops every fleet with array operations instead of one Python call per alien.
+        else:
+            self._check_fleet_edges()
+            self.aliens.update()
+
+        # Look for alien-ship collisions.
+        if self.fleet_engine:
+            ship_collision = any(self.fleet_engine.collides(ship.rect) for ship in self.ships)
+        elif self.collision_grid:
+            ship_collision = any(self.collision_grid.spritecollideany(ship) for ship in self.ships)
+        else:
+            ship_collision = any(pygame.sprite.spritecollideany(ship, self.aliens) for ship in self.ships) #two arguments: a sprite and a group. looks for any member of the group that has collided with the sprite and stops looping through the group as soon as it finds one member that has collided with the sprite. loops through the group aliens and returns the first alien it finds that has collided with ship
+        if ship_collision:
+            self._ship_hit()
+        
+        # Look for aliens hitting the bottom of the screen.
+        self._check_aliens_bottom()
+
+    def _update_alien_shots(self):
+        """Move the alien shots, check them against the ship, then let the aliens fire again."""
+        if self.hit_pause or not self.game_active: #The ship was already hit earlier in this timestep, and the shots have been cleared.
+            return
+        self.alien_shots.update() #Moves every shot and drops those below the screen in one batch.
+        if any(self.alien_shots.hits(ship.rect) for ship in self.ships):
+            self._ship_hit()
+            return
+        self.alien_shots.fire(self.stats.level) #New shots start from the bottom of random aliens, at the level's fire rate.
+
+    def _center_ships(self):
+        """Put the ships back at the bottom of the screen, spaced evenly when there's more than one."""
+        for index, ship in enumerate(self.ships):
+            ship.center_ship((index + 1) / (len(self.ships) + 1))
+
+    def _create_fleet(self):
+        """Start the current level's wave of fleets over."""
+        self.alien_pool.release_all(self.aliens) #Recycle whatever is left of the old fleets.
+        self.waves.start(self.stats.level) #The scheduler lays out each fleet with fleet_layout(), which works the positions out in closed form and caches them.
+        self._fleets_changed(new_wave=True)
+
+    def _fleets_changed(self, new_wave=False):
+        """Bring the fleet engine and the collision grid up to date after fleets arrive."""
+        if self.fleet_engine:
+            self.fleet_engine.rebuild(new_wave) #Copy the new fleets' positions into the engine's arrays.
+        if self.spatial_hash:
+            large = len(self.aliens) >= self.settings.collision_grid_min_aliens
+            self.collision_grid = self.spatial_hash if self.settings.collision_broadphase == 'grid' or large else None
+            if self.collision_grid:
+                self.collision_grid.rebuild(self.aliens)
+
+    def _check_aliens_bottom(self):
+        """Check if any aliens have reached the bottom of the screen."""
+        if self.fleet_engine:
+            if self.fleet_engine.reached_bottom():
+                self._ship_hit()
+            return
+
+        for alien in self.aliens.sprites():
+            if alien.rect.bottom >= self.settings.screen_height:
+                # Treat this the same as if the ship got hit.
+                self._ship_hit()
+                break
+
+    def _check_fleet_edges(self):
+        """Respond appropriately if any aliens have reached an edge."""
+        for fleet in self.waves.fleets: #Each fleet turns on its own.
+            for alien in fleet.aliens.sprites():
+                if alien.check_edges(): #If check_edges() returns True, we know an alien is at an edge and its whole fleet needs to change direction
+                    fleet.change_direction() #Drops each of the fleet's aliens by its drop speed, then changes the fleet's direction once.
+                    break
+
+    def _update_screen(self, alpha=1.0):
+        """Draw the sprites alpha of the way from their last timestep to their current one."""
+        interpolate = self.settings.interpolate and self.moved and alpha < 1.0
+        if interpolate:
+            self._interpolate(alpha)
+        else:
+            self.sync_alien_rects()
+        if self.settings.dirty_rendering:
+            self.pixels_touched = self.renderer.draw() #Only redraws and pushes the rects that changed this frame.
+        else:
+            self._draw_frame()
+        if interpolate:
+            self._restore_positions()
+
+    def _interpolate(self, alpha):
+        """Move the sprites' rects between their previous and current positions, for drawing only."""
+        for ship in self.ships:
+            ship.rect.x = ship.prev_x + (ship.x - ship.prev_x) * alpha
+        for bullet in self.bullets.sprites():
+            bullet.rect.y = bullet.prev_y + (bullet.y - bullet.prev_y) * alpha
+        self.alien_shots.alpha = alpha
+        if self.fleet_engine:
+            self.fleet_engine.interpolate(alpha)
+        else:
+            for alien in self.aliens.sprites():
+                alien.rect.x = alien.prev_x + (alien.x - alien.prev_x) * alpha #Only x is interpolated; a drop is a jump, the same as before.
+
+    def _restore_positions(self):
+        """Put the sprites' rects back where the simulation left them."""
+        for ship in self.ships:
+            ship.rect.x = ship.x
+        for bullet in self.bullets.sprites():
+            bullet.rect.y = bullet.y
+        self.alien_shots.alpha = 1.0
+        if not self.fleet_engine: #The engine's rects are left as drawn; sync_alien_rects() brings them back if anything reads them before the next frame.
+            for alien in self.aliens.sprites():
+                alien.rect.x = alien.x
+
+    def sync_alien_rects(self):
+        """Make the aliens' rects match the simulation, for code that reads them between drawn frames."""
+        if self.fleet_engine:
+            self.fleet_engine.sync_rects() #The numpy backend only moves its arrays each timestep.
+
+    def _draw_frame(self):
+        """Draw everything on the screen and flip to the new screen."""
+        self.draw_scene()
+        self.pixels_touched = self.settings.screen_width * self.settings.screen_height
+        pygame.display.flip() #Pygame uses two buffers: a front buffer and a back buffer. The front buffer is the one displayed on the screen, while the back buffer is where changes are made before being displayed. When pygame.display.flip() is called, the contents of the back buffer are swapped with the front buffer, making the updated frame visible to the user.
+
+    def draw_scene(self):
+        """Fill the screen and draw everything on it, without showing it; env.py grabs frames this way."""
+        self.screen.fill(self.settings.bg_colour)
+        for bullet in self.bullets.sprites(): #iterates over each bullet object in the self.bullets group. The sprites() method is called on the self.bullets group, which returns a list of all the sprite objects (bullets) contained within the group
+            bullet.draw_bullet() 
+        self.alien_shots.draw()
+        for ship in self.ships:
+            ship.blitme() #Draw ship on screen
+        self.aliens.draw(self.screen) #used to draw all the alien objects in the self.aliens group onto the game screen (self.screen). The draw() method is a built-in method provided by the pygame.sprite.Group class. In this case, self.aliens.draw() is called with the argument self.screen, which represents the game screen surface. By calling self.aliens.draw(self.screen), the draw() method iterates over each alien object in the self.aliens group and renders or blits their respective images onto the game screen.
+
+        # Draw the score information.
+        self.sb.show_score()
+
+        if self.settings.show_profiler:
+            self.profiler.draw_overlay()
+
+        # Draw the play button if the game is inactive.
+        if not self.game_active: #To make the Play button visible above all other elements on the screen, we draw it after all the other elements have been drawn but before flipping to a new screen.
+            self.play_button.draw_button()
+
+
+if __name__ == '__main__': #checks whether the current module is being run as the main program or if it is being imported as a module. When a Python module is run directly as the main     program (i.e., it is not imported by another module), the special variable __name__ is set to '__main__'. if a module is imported by another module, the value of __name__ is set to the module's name.
+    parser = argparse.ArgumentParser(description="Play Alien Invasion.")
+    parser.add_argument('--headless', action='store_true', help="simulate one game without a display and print the result")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the game's random number generator")
+    parser.add_argument('--profile', metavar='PATH', help="time every frame and save the profile to PATH (.csv or .json) on exit")
+    parser.add_argument('--record', metavar='PATH', help="log every input to PATH; play it back with replay.py")
+    parser.add_argument('--startup', action='store_true', help="print how long each stage of startup took")
+    parser.add_argument('--frames', type=int, default=60 * 60 * 10, help="longest headless game to simulate, in timesteps")
+    args = parser.parse_args()
+
+    if args.record and args.seed is None:
+        args.seed = random.randrange(2 ** 31) #A recording has to know the seed to be replayed exactly.
+
+    #Make a game instance and run the game.
+    ai = AlienInvasion(headless=args.headless, seed=args.seed)
+    if args.startup:
+        print(ai.startup_report())
+    if args.record:
+        ai.record(args.record)
+    if args.profile:
+        ai.settings.profile_frames = True
+        ai.settings.profile_dump_path = args.profile
+    if args.headless:
+        stats = ai.run_headless(args.frames)
+        print(f"score={stats.score} level={stats.level} ships_left={stats.ships_left} frames={ai.frame}")
+        if args.profile:
+            ai.profiler.dump(args.profile)
+    else:
+        ai.run_game()
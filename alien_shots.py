@@ -0,0 +1,141 @@
+from array import array
+
+import pygame
+
+try:
+    import numpy as np
+except ImportError: #NumPy is optional. Without it the shots are moved and checked one at a time.
+    np = None
+
+
+class AlienShots:
+    """A class to keep every alien shot in fixed, preallocated arrays.
+
+    Shots aren't Sprites: slot i of x, y and prev_y is one shot, and the first
+    count slots are the live ones. With NumPy, moving, culling and the ship
+    collision check are each one batched operation per timestep.
+    """
+
+    def __init__(self, ai_game):
+        """Allocate room for settings.alien_shot_limit shots."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.width = self.settings.alien_shot_width
+        self.height = self.settings.alien_shot_height
+        self.capacity = self.settings.alien_shot_limit #No more shots than this are in flight at once.
+        self.image = pygame.Surface((self.width, self.height)).convert(self.screen) #Every shot looks the same, so one filled Surface is blitted for all of them.
+        self.image.fill(self.settings.alien_shot_color)
+
+        self._x = array('d', bytes(8 * self.capacity)) #Left edge of each shot.
+        self._y = array('d', bytes(8 * self.capacity)) #Top edge of each shot.
+        self._prev_y = array('d', bytes(8 * self.capacity)) #Top edge at the previous timestep, for drawing between timesteps.
+        if np is not None: #NumPy views share the arrays' memory, so both paths see the same shots.
+            self.x = np.frombuffer(self._x, dtype=np.float64)
+            self.y = np.frombuffer(self._y, dtype=np.float64)
+            self.prev_y = np.frombuffer(self._prev_y, dtype=np.float64)
+        else:
+            self.x, self.y, self.prev_y = self._x, self._y, self._prev_y
+        self.count = 0
+        self.fire_budget = 0.0 #Shots owed; the fleet fires whenever this reaches one.
+        self.alpha = 1.0 #How far between the last two timesteps to draw the shots.
+
+    def __len__(self):
+        """Return the number of shots in flight."""
+        return self.count
+
+    def clear(self):
+        """Remove every shot, e.g. when a new fleet arrives."""
+        self.count = 0
+        self.fire_budget = 0.0
+
+    def fire(self, level):
+        """Have random aliens fire, at level's rate from Settings."""
+        aliens = self.ai_game.aliens
+        if not aliens:
+            return
+        self.fire_budget += self.settings.per_tick(self.settings.alien_fire_rate(level))
+        if self.fire_budget < 1:
+            return
+        engine = self.ai_game.fleet_engine #With the numpy backend the sprite rects are only up to date when drawn, so positions come from its arrays.
+        shooters = aliens.sprites()
+        rng = self.ai_game.rng #The game's seeded generator, so replays and batch runs stay exact.
+        while self.fire_budget >= 1:
+            self.fire_budget -= 1
+            if self.count == self.capacity:
+                continue
+            shooter = rng.randrange(len(shooters)) #Draws the same number as rng.choice(shooters).
+            if engine:
+                centerx, bottom = engine.shooter_position(shooter)
+            else:
+                centerx, bottom = shooters[shooter].rect.midbottom
+            index = self.count
+            self.x[index] = centerx - self.width // 2
+            self.y[index] = self.prev_y[index] = bottom
+            self.count += 1
+
+    def update(self):
+        """Move every shot down the screen and drop the ones that have left it."""
+        count = self.count
+        if not count:
+            return
+        step = self.settings.per_tick(self.settings.alien_shot_speed)
+        bottom = self.settings.screen_height
+        if np is not None:
+            y = self.y[:count]
+            self.prev_y[:count] = y
+            y += step
+            keep = y < bottom
+            if not keep.all(): #Pack the survivors into the front slots, keeping their order.
+                kept = int(keep.sum())
+                self.x[:kept] = self.x[:count][keep]
+                self.prev_y[:kept] = self.prev_y[:count][keep]
+                self.y[:kept] = y[keep]
+                self.count = kept
+            return
+
+        kept = 0
+        for index in range(count):
+            y = self.y[index]
+            if y + step < bottom:
+                self.x[kept] = self.x[index]
+                self.prev_y[kept] = y
+                self.y[kept] = y + step
+                kept += 1
+        self.count = kept
+
+    def hits(self, rect):
+        """Return True if any shot overlaps rect."""
+        count = self.count
+        if not count:
+            return False
+        if np is not None:
+            x, y = self.x[:count], self.y[:count]
+            return bool(((x < rect.right) & (x + self.width > rect.left)
+                         & (y < rect.bottom) & (y + self.height > rect.top)).any())
+        for index in range(count):
+            x, y = self.x[index], self.y[index]
+            if x < rect.right and x + self.width > rect.left and y < rect.bottom and y + self.height > rect.top:
+                return True
+        return False
+
+    def rects(self):
+        """Return a Rect for where each shot should be drawn."""
+        count = self.count
+        alpha = self.alpha
+        xs = self._x[:count].tolist()
+        if alpha == 1.0:
+            ys = self._y[:count].tolist()
+        elif np is not None:
+            prev_y = self.prev_y[:count]
+            ys = (prev_y + (self.y[:count] - prev_y) * alpha).tolist()
+        else:
+            ys = [prev + (y - prev) * alpha for prev, y in zip(self._prev_y[:count].tolist(), self._y[:count].tolist())]
+        return [pygame.Rect(x, y, self.width, self.height) for x, y in zip(xs, ys)] #Rect rounds the floats, the same as a sprite's rect.
+
+    def draw(self):
+        """Draw every shot and return the rects drawn."""
+        rects = self.rects()
+        image = self.image
+        self.screen.blits([(image, rect) for rect in rects], False) #One call for the lot; not asking for the rects back saves building a second list.
+        return rects
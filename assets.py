@@ -0,0 +1,135 @@
+import threading
+
+import pygame
+
+from glyphs import GlyphAtlas
+
+class AssetCache:
+    """A class to load each game image and font once and share it between sprites."""
+
+    def __init__(self):
+        """Initialize the cache and its hit/miss counters."""
+        self.images = {} #Maps (path, pixel format) to a converted Surface. Every sprite that asks for the same image gets the same Surface back instead of reading and decoding the file again.
+        self.hits = 0
+        self.misses = 0
+        self.atlas = None #A SpriteAtlas to serve packed images from, once one is built.
+        self.fonts = {} #Maps (name, size) to a Font, so the scoreboard and the button share one instead of each looking it up.
+        self.glyph_atlases = {} #Maps (font, text colour, background colour) to a GlyphAtlas. Kept on the cache, not the module, so they go away with the game.
+
+        # Background preloading; see start_preload().
+        self.preload_total = 0
+        self.preload_done = 0
+        self._preload_thread = None
+        self._preload_error = None
+        self._loaded_images = {} #Decoded but not yet converted images, by path.
+        self._loaded_atlas = None
+
+    def use_atlas(self, atlas):
+        """Serve the images packed in atlas from it from now on."""
+        self.atlas = atlas
+        self.clear()
+
+    def _format_key(self):
+        """Return a key describing the current display's pixel format."""
+        display = pygame.display.get_surface()
+        if display is None: #No display yet, so images can't be converted and are cached in their file format.
+            return None
+        return (display.get_bitsize(), display.get_masks())
+
+    def load_image(self, path):
+        """Return the shared Surface for path, loading and converting it on first use."""
+        key = (path, self._format_key())
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        if self.atlas is not None and path in self.atlas:
+            image = self.images[key] = self.atlas.image(path) #Already scaled and in the screen's format.
+            return image
+
+        image = self._loaded_images.pop(path, None) #Already read from disk by the preload thread?
+        if image is None:
+            image = pygame.image.load(path)
+        if key[1] is not None:
+            image = image.convert() #convert() puts the image in the same pixel format as the screen, so blitting it doesn't have to convert every pixel on every frame.
+        self.images[key] = image
+        return image
+
+    def load_font(self, name, size):
+        """Return the shared Font for name and size, creating it on first use."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = pygame.font.SysFont(name, size)
+        return font
+
+    def load_glyph_atlas(self, font, text_color, bg_color):
+        """Return the shared GlyphAtlas for a font from load_font() and a colour pair."""
+        key = (font, tuple(text_color), tuple(bg_color))
+        atlas = self.glyph_atlases.get(key)
+        if atlas is None:
+            atlas = self.glyph_atlases[key] = GlyphAtlas(font, text_color, bg_color)
+        return atlas
+
+    def start_preload(self, paths, fonts, make_atlas=None):
+        """Start reading images and fonts from disk on a worker thread.
+
+        make_atlas, if given, builds a SpriteAtlas on the worker too. Nothing
+        is converted to the screen's format until finish_preload() runs on the
+        main thread.
+        """
+        self.preload_total = len(fonts) + len(paths) + (1 if make_atlas else 0)
+        self.preload_done = 0
+        self._preload_thread = threading.Thread(target=self._preload, args=(list(paths), list(fonts), make_atlas),
+                                                name='asset-preload', daemon=True)
+        self._preload_thread.start()
+
+    def _preload(self, paths, fonts, make_atlas):
+        """Worker thread: build the fonts and the atlas, and decode any images the atlas doesn't hold."""
+        try:
+            for name, size in fonts: #The first SysFont() call scans the system's fonts, which is most of a cold start.
+                self.load_font(name, size)
+                self.preload_done += 1
+            if make_atlas:
+                self._loaded_atlas = make_atlas()
+                self.preload_done += 1
+            for path in paths:
+                if self._loaded_atlas is None or path not in self._loaded_atlas:
+                    self._loaded_images[path] = pygame.image.load(path)
+                self.preload_done += 1
+        except Exception as error: #Re-raised on the main thread by finish_preload().
+            self._preload_error = error
+
+    @property
+    def preloading(self):
+        """Return True while the preload thread is still working."""
+        return self._preload_thread is not None and self._preload_thread.is_alive()
+
+    def wait_preload(self, timeout):
+        """Wait up to timeout seconds for the preload thread, returning as soon as it finishes."""
+        if self._preload_thread is not None:
+            self._preload_thread.join(timeout)
+
+    def finish_preload(self, paths):
+        """Wait for the preload thread, then convert what it loaded on this thread."""
+        if self._preload_thread is not None:
+            self._preload_thread.join()
+            self._preload_thread = None
+        if self._preload_error is not None:
+            error, self._preload_error = self._preload_error, None
+            raise error
+        if self._loaded_atlas is not None:
+            self.use_atlas(self._loaded_atlas)
+            self._loaded_atlas = None
+        self.preload(paths)
+
+    def preload(self, paths):
+        """Load every image in paths so the first sprites don't hit the disk."""
+        for path in paths:
+            self.load_image(path)
+
+    def clear(self):
+        """Forget every cached image, e.g. after the display mode changes."""
+        self.images.clear()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+
+import pygame
+
+
+class SpriteAtlas:
+    """A class to pack the game's images into one display-format Surface.
+
+    The packed, scaled atlas is saved in a cache directory keyed by screen
+    size, scale and the source files, so later launches just load it. It can
+    be built on a worker thread; the sheet is converted to the screen's format
+    the first time an image is taken from it, on the thread that draws.
+    """
+
+    def __init__(self, paths, screen_size, settings):
+        """Build the atlas from the images in paths, or load it from the cache."""
+        self.paths = list(paths)
+        self.settings = settings
+        self.scale = self._pick_scale(screen_size)
+        self.regions = {} #Maps each source path to its Rect inside the atlas.
+        self.images = {} #Maps each source path to a subsurface of the atlas.
+        self.from_cache = False
+
+        key = self._cache_key(screen_size)
+        image_path = os.path.join(settings.atlas_cache_dir, f"atlas_{key}.bmp")
+        regions_path = os.path.join(settings.atlas_cache_dir, f"atlas_{key}.json")
+
+        sheet = self._load_cached(image_path, regions_path)
+        if sheet is None:
+            sheet = self._build()
+            self._save(sheet, image_path, regions_path)
+
+        self.sheet = sheet
+        self.converted = False
+
+    def _convert(self):
+        """Put the atlas in the screen's pixel format, so every blit from it is a straight copy."""
+        self.sheet = self.sheet.convert()
+        if self.settings.sprite_colorkey is not None:
+            self.sheet.set_colorkey(self.settings.sprite_colorkey, pygame.RLEACCEL)
+        self.converted = True
+
+    def _pick_scale(self, screen_size):
+        """Return how much to scale the images for this screen size."""
+        if self.settings.sprite_scale is not None:
+            return self.settings.sprite_scale
+        reference_width, reference_height = self.settings.sprite_reference_size #The screen size the images were drawn for.
+        return min(screen_size[0] / reference_width, screen_size[1] / reference_height)
+
+    def _cache_key(self, screen_size):
+        """Return a name that changes whenever the screen size, scale or any source image changes."""
+        digest = hashlib.sha1()
+        for path in self.paths:
+            info = os.stat(path)
+            digest.update(f"{path}:{info.st_size}:{info.st_mtime_ns};".encode())
+        return f"{screen_size[0]}x{screen_size[1]}_{self.scale:.3f}_{digest.hexdigest()[:12]}"
+
+    def _load_cached(self, image_path, regions_path):
+        """Return the cached atlas Surface and fill in self.regions, or return None."""
+        try:
+            with open(regions_path) as file:
+                regions = json.load(file)
+            sheet = pygame.image.load(image_path)
+        except (OSError, ValueError, pygame.error):
+            return None
+        if sorted(regions) != sorted(self.paths):
+            return None
+        self.regions = {path: pygame.Rect(rect) for path, rect in regions.items()}
+        self.from_cache = True
+        return sheet
+
+    def _build(self):
+        """Load, scale and pack the source images side by side into one Surface."""
+        images = []
+        for path in self.paths:
+            image = pygame.image.load(path).convert(32) #smoothscale() needs a 24 or 32 bit image, whatever the file was saved as. A plain 32 bit copy, not the screen's format, so this is safe off the main thread.
+            if self.scale != 1:
+                size = (max(1, round(image.get_width() * self.scale)), max(1, round(image.get_height() * self.scale)))
+                image = pygame.transform.smoothscale(image, size)
+            images.append(image)
+
+        padding = 1 #A pixel between images stops scaled edges bleeding into their neighbours.
+        width = sum(image.get_width() + padding for image in images)
+        height = max(image.get_height() for image in images)
+        sheet = pygame.Surface((width, height))
+        sheet.fill(self.settings.sprite_colorkey or self.settings.bg_colour)
+
+        x = 0
+        for path, image in zip(self.paths, images):
+            self.regions[path] = sheet.blit(image, (x, 0))
+            x += image.get_width() + padding
+        return sheet
+
+    def _save(self, sheet, image_path, regions_path):
+        """Write the atlas to the cache; a failed write just means it's rebuilt next time."""
+        try:
+            os.makedirs(self.settings.atlas_cache_dir, exist_ok=True)
+            # Write to temporary files and move them into place, so a half-written atlas is never loaded.
+            temp_image_path = f"{image_path}.{os.getpid()}.tmp.bmp"
+            pygame.image.save(sheet, temp_image_path)
+            temp_regions_path = f"{regions_path}.{os.getpid()}.tmp"
+            with open(temp_regions_path, 'w') as file:
+                json.dump({path: list(rect) for path, rect in self.regions.items()}, file)
+            os.replace(temp_image_path, image_path)
+            os.replace(temp_regions_path, regions_path)
+        except (OSError, pygame.error):
+            pass
+
+    def image(self, path):
+        """Return path's image as a subsurface of the atlas."""
+        image = self.images.get(path)
+        if image is None:
+            if not self.converted:
+                self._convert()
+            image = self.images[path] = self.sheet.subsurface(self.regions[path])
+        return image
+
+    def __contains__(self, path):
+        """Return True if path was packed into the atlas."""
+        return path in self.regions
@@ -0,0 +1,164 @@
+import argparse
+import struct
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from alien_invasion import AlienInvasion
+
+# Each column of the results file: (name, array typecode).
+COLUMNS = [
+    ('seed', 'q'),
+    ('score', 'q'),
+    ('level', 'i'),
+    ('ships_left', 'i'),
+    ('frames', 'q'),
+]
+MAGIC = b'AIBR1' #Marks the start of a batch results file.
+
+
+def idle_policy(ai_game):
+    """Never move or fire."""
+
+
+def random_policy(ai_game):
+    """Mash random keys, using the game's own seeded generator."""
+    rng = ai_game.rng
+    if ai_game.frame % 10 == 0: #Pick a new direction every 10 timesteps so the ship actually gets somewhere.
+        direction = rng.choice((-1, 0, 1))
+        ai_game.ship.moving_left = direction < 0
+        ai_game.ship.moving_right = direction > 0
+    if rng.random() < 0.2:
+        ai_game._fire_bullet()
+
+
+def scripted_policy(ai_game):
+    """Chase the nearest alien in the lowest row and fire when under it."""
+    aliens = ai_game.aliens.sprites()
+    if not aliens:
+        return
+    ai_game.sync_alien_rects()
+    ship = ai_game.ship
+    target = max(aliens, key=lambda alien: (alien.rect.bottom, -abs(alien.rect.centerx - ship.rect.centerx)))
+    ship.moving_left = target.rect.centerx < ship.rect.centerx - 5
+    ship.moving_right = target.rect.centerx > ship.rect.centerx + 5
+    if abs(target.rect.centerx - ship.rect.centerx) < target.rect.width:
+        ai_game._fire_bullet()
+
+
+POLICIES = {
+    'idle': idle_policy,
+    'random': random_policy,
+    'scripted': scripted_policy,
+}
+
+
+def play_one(seed, policy_name, max_frames):
+    """Play one headless game and return a row of results."""
+    ai_game = AlienInvasion(headless=True, seed=seed) #A fresh game per seed, so the result only depends on the seed and the policy.
+    stats = ai_game.run_headless(max_frames, POLICIES[policy_name])
+    return (seed, stats.score, stats.level, stats.ships_left, ai_game.frame)
+
+
+def _play_chunk(args):
+    """Play a run of seeds in a worker process."""
+    seeds, policy_name, max_frames = args
+    return [play_one(seed, policy_name, max_frames) for seed in seeds]
+
+
+class ResultsWriter:
+    """A class to stream result rows to a compact columnar file."""
+
+    def __init__(self, path, block_rows=1024):
+        """Open path and write the file header."""
+        self.file = open(path, 'wb')
+        self.file.write(MAGIC)
+        self.block_rows = block_rows
+        self._reset_block()
+
+    def _reset_block(self):
+        """Start a new, empty block of column buffers."""
+        self.columns = [array(typecode) for _, typecode in COLUMNS]
+
+    def write(self, row):
+        """Add one row; a full block is flushed to disk."""
+        for column, value in zip(self.columns, row):
+            column.append(value)
+        if len(self.columns[0]) >= self.block_rows:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one block: a row count, then each column's packed values."""
+        rows = len(self.columns[0])
+        if not rows:
+            return
+        self.file.write(struct.pack('<I', rows))
+        for column in self.columns:
+            if sys.byteorder != 'little':
+                column.byteswap()
+            column.tofile(self.file)
+        self.file.flush()
+        self._reset_block()
+
+    def close(self):
+        """Flush any remaining rows and close the file."""
+        self.flush()
+        self.file.close()
+
+
+def read_results(path):
+    """Read a results file back into a dict of column name -> array."""
+    results = {name: array(typecode) for name, typecode in COLUMNS}
+    with open(path, 'rb') as file:
+        if file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a batch results file.")
+        while True:
+            header = file.read(4)
+            if len(header) < 4:
+                break
+            rows, = struct.unpack('<I', header)
+            block = []
+            try:
+                for name, typecode in COLUMNS:
+                    column = array(typecode)
+                    column.fromfile(file, rows)
+                    block.append(column)
+            except (EOFError, ValueError): #A half-written last block (the batch was killed mid-write); keep the complete blocks before it.
+                break
+            for (name, _), column in zip(COLUMNS, block):
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                results[name].extend(column)
+    return results
+
+
+def run_batch(games, out_path, policy_name='random', workers=None, max_frames=60 * 60 * 10,
+              first_seed=0, chunk_size=16):
+    """Play headless games across a process pool and stream the results to out_path."""
+    seeds = range(first_seed, first_seed + games)
+    chunks = [(seeds[i:i + chunk_size], policy_name, max_frames) for i in range(0, games, chunk_size)]
+    writer = ResultsWriter(out_path)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for rows in executor.map(_play_chunk, chunks): #map() hands results back in seed order, so the file is the same however many workers ran it.
+                for row in rows:
+                    writer.write(row)
+    finally:
+        writer.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play many headless games of Alien Invasion in parallel.")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random', help="how the simulated player behaves")
+    parser.add_argument('--frames', type=int, default=60 * 60 * 10, help="longest game to play, in timesteps")
+    parser.add_argument('--first-seed', type=int, default=0, help="seed of the first game; game i uses first_seed + i")
+    parser.add_argument('--out', default='batch_results.bin', help="where to write the results")
+    args = parser.parse_args()
+
+    run_batch(args.games, args.out, args.policy, args.workers, args.frames, args.first_seed)
+    results = read_results(args.out)
+    scores = results['score']
+    if scores:
+        print(f"{len(scores)} games, mean score {sum(scores) / len(scores):,.0f}, best {max(scores):,}")
@@ -0,0 +1,179 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+from time import perf_counter
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy') #Benchmarks run off-screen, so they work the same on a machine without a display.
+
+from alien_invasion import AlienInvasion
+from alien_shots import AlienShots
+
+RESOLUTIONS = [(800, 600), (1200, 800), (1920, 1080), (2560, 1440)]
+BULLET_COUNTS = [3, 30, 300] #Bullets in flight for the collision benchmarks.
+SHOT_COUNTS = [10, 256] #Alien shots in flight for the alien shot benchmark.
+
+
+def _time(run, setup=None, repeat=50):
+    """Return the median time of run() over repeat calls, running setup() untimed before each."""
+    times = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = perf_counter()
+        run()
+        times.append(perf_counter() - start)
+    return statistics.median(times)
+
+
+def _new_game(resolution):
+    """Return a headless game at resolution with a game in progress."""
+    ai_game = AlienInvasion(headless=True, seed=0, screen_size=resolution)
+    ai_game.start_game()
+    return ai_game
+
+
+def bench_create_fleet(ai_game, repeat):
+    """Time building a whole new fleet."""
+    return _time(ai_game._create_fleet, repeat=repeat)
+
+
+def bench_update_aliens(ai_game, repeat):
+    """Time one fleet step: edges, movement, ship collision and the bottom check."""
+    ai_game._create_fleet()
+    return _time(ai_game._update_aliens, repeat=repeat)
+
+
+def bench_collisions(ai_game, repeat, bullets):
+    """Time one collision check with bullets spread over the fleet's area."""
+    rng = random.Random(0)
+    ai_game.settings.bullets_allowed = bullets
+    screen_rect = ai_game.screen.get_rect()
+
+    def setup():
+        ai_game._create_fleet()
+        ai_game.bullet_pool.release_all(ai_game.bullets)
+        for _ in range(bullets):
+            bullet = ai_game.bullet_pool.acquire()
+            bullet.rect.midtop = (rng.randrange(screen_rect.width), rng.randrange(screen_rect.height))
+            bullet.y = float(bullet.rect.y)
+            ai_game.bullets.add(bullet)
+
+    return _time(ai_game._check_bullet_alien_collisions, setup, repeat)
+
+
+def bench_alien_shots(ai_game, repeat, shots):
+    """Time moving, culling and ship-checking shots spread over the screen."""
+    rng = random.Random(0)
+    ai_game.settings.alien_shot_limit = shots
+    ai_game.alien_shots = alien_shots = AlienShots(ai_game)
+    screen_rect = ai_game.screen.get_rect()
+    ship_top = ai_game.ship.rect.top #Keep the shots above the ship so none of them end the game.
+
+    def setup():
+        alien_shots.clear()
+        for index in range(shots):
+            alien_shots.x[index] = rng.randrange(screen_rect.width)
+            alien_shots.y[index] = rng.randrange(ship_top - 20)
+        alien_shots.count = shots
+
+    def run():
+        alien_shots.update()
+        alien_shots.hits(ai_game.ship.rect)
+
+    return _time(run, setup, repeat)
+
+
+def bench_prep_score(ai_game, repeat):
+    """Time refreshing the scoreboard after the score changes."""
+    def setup():
+        ai_game.stats.score += 12340 #A new value each time, so the image really has to change.
+    return _time(ai_game.sb.refresh, setup, repeat)
+
+
+def bench_update_screen(ai_game, repeat, dirty, setup=None):
+    """Time drawing one frame (full or dirty-rect), with the fleet moving between frames."""
+    ai_game.settings.dirty_rendering = dirty
+    ai_game.renderer.invalidate()
+    ai_game._update_screen() #The first dirty frame is a full redraw; don't count it.
+    return _time(ai_game._update_screen, setup or ai_game._update_aliens, repeat)
+
+
+def bench_update_screen_static(ai_game, repeat, dirty):
+    """Time drawing one frame of a mostly static screen: three aliens left and the ship moving."""
+    for alien in ai_game.aliens.sprites()[3:]:
+        ai_game.alien_pool.release(alien)
+    ai_game._fleets_changed()
+    ai_game.ship.moving_right = True
+
+    def setup():
+        ai_game.ship.update()
+        ai_game._update_aliens()
+
+    return bench_update_screen(ai_game, repeat, dirty, setup)
+
+
+def run_benchmarks(resolutions, repeat):
+    """Run every benchmark at every resolution and return {name: median seconds}."""
+    results = {}
+    for width, height in resolutions:
+        tag = f"{width}x{height}"
+        results[f"create_fleet[{tag}]"] = bench_create_fleet(_new_game((width, height)), repeat)
+        results[f"update_aliens[{tag}]"] = bench_update_aliens(_new_game((width, height)), repeat)
+        for bullets in BULLET_COUNTS:
+            results[f"collisions[{tag},bullets={bullets}]"] = bench_collisions(_new_game((width, height)), repeat, bullets)
+        for shots in SHOT_COUNTS:
+            results[f"alien_shots[{tag},shots={shots}]"] = bench_alien_shots(_new_game((width, height)), repeat, shots)
+        results[f"prep_score[{tag}]"] = bench_prep_score(_new_game((width, height)), repeat)
+        results[f"update_screen[{tag},full]"] = bench_update_screen(_new_game((width, height)), repeat, False)
+        results[f"update_screen[{tag},dirty]"] = bench_update_screen(_new_game((width, height)), repeat, True)
+        results[f"update_screen_static[{tag},full]"] = bench_update_screen_static(_new_game((width, height)), repeat, False)
+        results[f"update_screen_static[{tag},dirty]"] = bench_update_screen_static(_new_game((width, height)), repeat, True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Return the names of benchmarks more than threshold slower than the baseline."""
+    regressions = []
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        if base and seconds > base * (1 + threshold):
+            regressions.append(name)
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark the game loop's hot paths.")
+    parser.add_argument('--baseline', default='benchmark_baseline.json', help="JSON file of baseline timings")
+    parser.add_argument('--save', action='store_true', help="save these results as the new baseline")
+    parser.add_argument('--threshold', type=float, default=0.25, help="fail if a benchmark is this fraction slower than its baseline")
+    parser.add_argument('--repeat', type=int, default=50, help="timed calls per benchmark (the median is kept)")
+    parser.add_argument('--resolution', action='append', metavar='WxH', help="resolution to test (repeatable; default: a standard set)")
+    args = parser.parse_args()
+
+    resolutions = [tuple(int(n) for n in value.split('x')) for value in args.resolution] if args.resolution else RESOLUTIONS
+    results = run_benchmarks(resolutions, args.repeat)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        change = f"{(seconds / base - 1) * 100:+6.1f}%" if base else "   new"
+        print(f"{name:<45} {seconds * 1e6:10.1f} us  {change}")
+
+    if args.save:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=1, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+    else:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) more than {args.threshold:.0%} slower than the baseline:")
+            for name in regressions:
+                print(f"  {name}")
+            sys.exit(1)
@@ -0,0 +1,380 @@
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+from collections import deque
+from time import perf_counter
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+from netcode import (HELLO, INPUT, SNAPSHOT, INPUT_BODY, SNAPSHOT_HEADER, LEFT, RIGHT, FIRE, START,
+                     FRAME, NetCounters, SnapshotReader, SnapshotWriter, empty_snapshot, encode_delta,
+                     pack_message, read_message)
+
+WRITE_BUFFER_LIMIT = 64 * 1024 #Bytes queued for a client before its snapshots are skipped until it catches up.
+
+
+class PlayerConnection:
+    """A class to hold what the server knows about one connected player."""
+
+    def __init__(self, player, writer):
+        """Initialize a connection for player; nothing has been sent or applied yet."""
+        self.player = player #Index of the player's ship in ai_game.ships.
+        self.writer = writer
+        self.baseline = empty_snapshot() #The last snapshot sent; the next one is encoded against it.
+        self.ack = 0 #Sequence number of the last input applied.
+
+
+class CoopServer:
+    """A class to run the one true game and stream it to the players over TCP.
+
+    Each tick the server advances its AlienInvasion one fixed timestep and sends
+    every client a snapshot delta-encoded against the last one that client was
+    sent. TCP delivers in order, so that is always the snapshot the client
+    holds. Inputs are applied as they arrive, between ticks, the same way a
+    local game handles key events before advancing.
+    """
+
+    def __init__(self, players=2, host='127.0.0.1', port=5555, seed=None, report_interval=5.0):
+        """Make the headless game the players will share."""
+        self.ai_game = AlienInvasion(headless=True, seed=seed, players=players)
+        self.settings = self.ai_game.settings
+        self.host = host
+        self.port = port
+        self.report_interval = report_interval #Seconds between counter reports; 0 for none, leaving the counters to run for the whole game.
+        self.connections = [None] * players #The PlayerConnection for each ship, or None while no one is playing it.
+        self.snapshots = SnapshotWriter(self.ai_game)
+        self.counters = NetCounters()
+        self.tick = 0
+        self.server = None
+        self.handlers = set() #The task serving each connected player.
+
+    async def start(self):
+        """Start listening; with port 0, self.port becomes the port picked."""
+        self.server = await asyncio.start_server(self._serve_player, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def run(self, duration=None):
+        """Tick the game at settings.tick_rate until cancelled or duration seconds pass."""
+        loop = asyncio.get_running_loop()
+        timestep = 1 / self.settings.tick_rate
+        next_tick = loop.time()
+        end = None if duration is None else next_tick + duration
+        next_report = next_tick + self.report_interval
+        while end is None or loop.time() < end:
+            self.ai_game.advance()
+            self.tick += 1
+            self.counters.ticks += 1
+            self._broadcast()
+
+            next_tick += timestep
+            now = loop.time()
+            if now - next_tick > timestep * self.settings.max_ticks_per_frame:
+                next_tick = now #Too far behind: drop the backlog, the same as run_game().
+            if self.report_interval and now >= next_report:
+                print(f"tick {self.tick}: {self.counters.report()}", flush=True)
+                self.counters.reset() #Each report covers just its own interval.
+                next_report = now + self.report_interval
+            await asyncio.sleep(max(next_tick - now, 0))
+
+    async def close(self):
+        """Stop listening, hang up on every player and wait for their tasks to finish."""
+        if self.server:
+            self.server.close()
+        for connection in self.connections:
+            if connection:
+                connection.writer.close() #Each player's task then reads the end of the stream and returns.
+        await asyncio.gather(*self.handlers, return_exceptions=True)
+
+    def _broadcast(self):
+        """Send this tick's snapshot to every player."""
+        snapshot = self.snapshots.capture()
+        encoded = {} #Players holding the same baseline (usually all of them) share one encoding.
+        for connection in self.connections:
+            if connection is None:
+                continue
+            if connection.writer.transport.get_write_buffer_size() > WRITE_BUFFER_LIMIT:
+                self.counters.skipped += 1 #Its baseline stays put, so the next snapshot it gets still decodes.
+                continue
+            key = id(connection.baseline)
+            if key not in encoded:
+                encoded[key] = encode_delta(connection.baseline, snapshot)
+            message = pack_message(SNAPSHOT, SNAPSHOT_HEADER.pack(self.tick, connection.ack) + encoded[key])
+            connection.writer.write(message)
+            connection.baseline = snapshot
+            self.counters.messages_sent += 1
+            self.counters.bytes_sent += len(message)
+
+    async def _serve_player(self, reader, writer):
+        """Give a new client a free ship, then apply its inputs until it leaves."""
+        if None not in self.connections:
+            writer.close() #The game is full.
+            return
+        player = self.connections.index(None)
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        connection = self.connections[player] = PlayerConnection(player, writer)
+        hello = {
+            'player': player,
+            'players': len(self.connections),
+            'tick_rate': self.settings.tick_rate,
+            'screen_size': [self.settings.screen_width, self.settings.screen_height],
+            'image_paths': self.snapshots.image_paths,
+        }
+        writer.write(pack_message(HELLO, json.dumps(hello).encode()))
+        if None not in self.connections and not self.ai_game.game_active: #Everyone's here.
+            self.ai_game.start_game()
+            self.counters.reset()
+
+        ship = self.ai_game.ships[player]
+        try:
+            while True:
+                kind, body = await read_message(reader)
+                self.counters.messages_received += 1
+                self.counters.bytes_received += FRAME.size + len(body)
+                if kind == INPUT:
+                    if len(body) != INPUT_BODY.size:
+                        break #Not a client we understand; drop it.
+                    connection.ack, buttons = INPUT_BODY.unpack(body)
+                    ship.moving_left = bool(buttons & LEFT)
+                    ship.moving_right = bool(buttons & RIGHT)
+                    if buttons & FIRE:
+                        self.ai_game._fire_bullet(ship)
+                    if buttons & START and not self.ai_game.game_active:
+                        self.ai_game.start_game()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass #The player left.
+        finally:
+            ship.moving_left = ship.moving_right = False
+            self.connections[player] = None
+            self.handlers.discard(task)
+            writer.close()
+
+
+class CoopClient:
+    """A class to send one player's input to a CoopServer and draw the snapshots it sends back.
+
+    The client's AlienInvasion never advances; SnapshotReader poses its sprites
+    and it draws them as usual. Latency is timed from sending an input to
+    receiving the first snapshot that has applied it.
+    """
+
+    def __init__(self, host='127.0.0.1', port=5555, headless=False, bot=False, seed=None):
+        """Initialize a client; bot plays random inputs instead of reading the keyboard."""
+        self.host = host
+        self.port = port
+        self.headless = headless
+        self.bot = bot
+        self.rng = random.Random(seed)
+        self.ai_game = None
+        self.reader = None
+        self.writer = None
+        self.counters = NetCounters()
+        self.sequence = 0
+        self.buttons = 0 #The held buttons last sent.
+        self.unacknowledged = deque() #(sequence number, time sent) of inputs not yet applied by the server.
+        self.latencies = [] #Seconds from sending an input to seeing it applied.
+        self.fresh = False #True when a snapshot has arrived since the last frame was drawn.
+        self.running = True
+
+    async def run(self, duration=None):
+        """Play until the window is closed, the server hangs up, or duration seconds pass; return the summary."""
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        kind, body = await read_message(self.reader)
+        if kind != HELLO:
+            raise ConnectionError("The server didn't say hello.")
+        hello = json.loads(body)
+        self.player = hello['player']
+        settings = Settings()
+        settings.persist_scores = False #The score belongs to the server's game; the local high score table has no part in it.
+        self.ai_game = ai_game = AlienInvasion(headless=self.headless, screen_size=tuple(hello['screen_size']), players=hello['players'],
+                                               settings=settings)
+        if self.player: #Show this player's own ship untinted.
+            ships = ai_game.ships
+            ships[0].image, ships[self.player].image = ships[self.player].image, ships[0].image
+        self.snapshots = SnapshotReader(ai_game, hello['image_paths'])
+        self.counters.reset()
+
+        receiving = asyncio.create_task(self._receive())
+        loop = asyncio.get_running_loop()
+        end = None if duration is None else loop.time() + duration
+        interval = 1 / hello['tick_rate'] if self.headless else 1 / (ai_game.settings.render_fps_cap or 240)
+        try:
+            while self.running and not receiving.done() and (end is None or loop.time() < end):
+                if self.bot:
+                    self._bot_input()
+                else:
+                    self._check_events()
+                if self.fresh and not self.headless:
+                    ai_game._update_screen()
+                self.fresh = False
+                await asyncio.sleep(interval)
+        finally:
+            receiving.cancel()
+            self.writer.close()
+        return self.summary()
+
+    async def _receive(self):
+        """Apply snapshots as they arrive, until the server hangs up."""
+        try:
+            while True:
+                kind, body = await read_message(self.reader)
+                now = perf_counter()
+                self.counters.messages_received += 1
+                self.counters.bytes_received += FRAME.size + len(body)
+                if kind != SNAPSHOT:
+                    continue
+                tick, ack = SNAPSHOT_HEADER.unpack_from(body)
+                self.snapshots.apply(body, SNAPSHOT_HEADER.size)
+                self.counters.ticks += 1
+                while self.unacknowledged and self.unacknowledged[0][0] <= ack:
+                    self.latencies.append(now - self.unacknowledged.popleft()[1])
+                self.fresh = True
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+    def _send(self, buttons):
+        """Send the buttons held, plus any one-off FIRE or START."""
+        self.sequence += 1
+        message = pack_message(INPUT, INPUT_BODY.pack(self.sequence, buttons))
+        self.writer.write(message)
+        self.unacknowledged.append((self.sequence, perf_counter()))
+        self.counters.messages_sent += 1
+        self.counters.bytes_sent += len(message)
+        self.buttons = buttons & (LEFT | RIGHT)
+
+    def _check_events(self):
+        """Turn keypresses into inputs for the server; only changes are sent."""
+        held = self.buttons
+        actions = 0
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_q):
+                self.running = False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_LEFT:
+                    held |= LEFT
+                elif event.key == pygame.K_RIGHT:
+                    held |= RIGHT
+                elif event.key == pygame.K_SPACE:
+                    actions |= FIRE
+                elif event.key == pygame.K_p:
+                    actions |= START
+                elif event.key == pygame.K_F2:
+                    self.ai_game.settings.dirty_rendering = not self.ai_game.settings.dirty_rendering
+                    self.ai_game.renderer.invalidate()
+            elif event.type == pygame.KEYUP:
+                if event.key == pygame.K_LEFT:
+                    held &= ~LEFT
+                elif event.key == pygame.K_RIGHT:
+                    held &= ~RIGHT
+            elif event.type == pygame.MOUSEBUTTONDOWN and self.ai_game.play_button.rect.collidepoint(event.pos):
+                actions |= START
+        if held != self.buttons or actions:
+            self._send(held | actions)
+
+    def _bot_input(self):
+        """Play like batch.random_policy: wander, fire often, and start a new game when one ends."""
+        rng = self.rng
+        held = self.buttons
+        actions = 0
+        if rng.random() < 0.1:
+            held = rng.choice((0, LEFT, RIGHT))
+        if rng.random() < 0.2:
+            actions |= FIRE
+        if not self.ai_game.game_active and self.counters.ticks:
+            actions |= START
+        if held != self.buttons or actions:
+            self._send(held | actions)
+
+    def summary(self):
+        """Return the client's counters and input latency as a dict."""
+        summary = self.counters.summary()
+        summary['player'] = getattr(self, 'player', None)
+        summary['inputs'] = self.sequence
+        if self.latencies:
+            latencies = sorted(self.latencies)
+            summary['latency_ms'] = {
+                'p50': statistics.median(latencies) * 1000,
+                'p99': latencies[int(0.99 * (len(latencies) - 1))] * 1000,
+                'max': latencies[-1] * 1000,
+            }
+        return summary
+
+
+async def bench(players, seconds, seed):
+    """Serve a game here and play it from players headless bot processes; return (server, client summaries)."""
+    server = CoopServer(players=players, port=0, seed=seed, report_interval=0)
+    await server.start()
+    clients = [await asyncio.create_subprocess_exec(sys.executable, __file__, 'client', '--port', str(server.port),
+                                                    '--headless', '--bot', '--seed', str(index), '--seconds', str(seconds), '--json',
+                                                    stdout=asyncio.subprocess.PIPE)
+               for index in range(players)]
+    ticking = asyncio.create_task(server.run())
+    try:
+        outputs = await asyncio.gather(*(client.communicate() for client in clients))
+    finally:
+        ticking.cancel()
+        await server.close()
+    summaries = [json.loads(stdout.decode().strip().splitlines()[-1]) for stdout, _ in outputs]
+    return server.counters.summary(), summaries
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play Alien Invasion co-op over the network.")
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('server', help="run the game and wait for players")
+    serve.add_argument('--host', default='127.0.0.1', help="address to listen on (0.0.0.0 for the LAN)")
+    serve.add_argument('--port', type=int, default=5555)
+    serve.add_argument('--players', type=int, default=2, help="ships in the game; it starts when they're all connected")
+    serve.add_argument('--seed', type=int, default=None, help="seed for the game's random number generator")
+    serve.add_argument('--report', type=float, default=5.0, help="seconds between tick-rate and bandwidth reports (0 for none)")
+    join = commands.add_parser('client', help="join a server")
+    join.add_argument('--host', default='127.0.0.1')
+    join.add_argument('--port', type=int, default=5555)
+    join.add_argument('--headless', action='store_true', help="don't open a window")
+    join.add_argument('--bot', action='store_true', help="play random inputs instead of reading the keyboard")
+    join.add_argument('--seed', type=int, default=None, help="seed for the bot's inputs")
+    join.add_argument('--seconds', type=float, default=None, help="leave after this long")
+    join.add_argument('--json', action='store_true', help="print the summary as JSON")
+    measure = commands.add_parser('bench', help="serve a game to headless bot clients in other processes and report latency and bytes per tick")
+    measure.add_argument('--players', type=int, default=2)
+    measure.add_argument('--seconds', type=float, default=10.0)
+    measure.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == 'server':
+        server = CoopServer(args.players, args.host, args.port, args.seed, args.report)
+
+        async def serve_forever():
+            await server.start()
+            print(f"Serving {args.players} players on {args.host}:{server.port}", flush=True)
+            await server.run()
+
+        try:
+            asyncio.run(serve_forever())
+        except KeyboardInterrupt: #Ctrl+C stops the server.
+            pass
+    elif args.command == 'client':
+        client = CoopClient(args.host, args.port, args.headless, args.bot, args.seed)
+        summary = asyncio.run(client.run(args.seconds))
+        if args.json:
+            print(json.dumps(summary))
+        else:
+            latency = summary.get('latency_ms', {})
+            print(f"player {summary['player']}: {summary['tick_rate']:.1f} snapshots/s  "
+                  f"{summary['bytes_received_per_tick']:.1f} B/snapshot  input latency p50 {latency.get('p50', 0):.1f} ms "
+                  f"p99 {latency.get('p99', 0):.1f} ms")
+    else:
+        server_summary, client_summaries = asyncio.run(bench(args.players, args.seconds, args.seed))
+        print(f"server: {server_summary['tick_rate']:.1f} ticks/s  {server_summary['bytes_sent_per_tick']:.1f} B/tick sent "
+              f"to {args.players} players  {server_summary['bytes_received_per_tick']:.1f} B/tick received  "
+              f"skipped {server_summary['skipped']}")
+        for summary in client_summaries:
+            latency = summary.get('latency_ms', {})
+            print(f"player {summary['player']}: {summary['tick_rate']:.1f} snapshots/s  "
+                  f"{summary['bytes_received_per_tick']:.1f} B/snapshot  {summary['inputs']} inputs  "
+                  f"latency p50 {latency.get('p50', 0):.1f} ms  p99 {latency.get('p99', 0):.1f} ms  max {latency.get('max', 0):.1f} ms")
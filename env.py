@@ -0,0 +1,310 @@
+import argparse
+import multiprocessing
+import os
+import random
+from multiprocessing import shared_memory
+from time import perf_counter
+
+try:
+    import numpy as np
+except ImportError: #NumPy is optional for the game, but the environments hand out NumPy arrays.
+    np = None
+
+import pygame
+
+from alien_invasion import AlienInvasion
+from settings import Settings
+
+# The actions a bot can take each step, as (direction, fire).
+ACTIONS = (
+    (0, False), #Stay still.
+    (-1, False), #Move left.
+    (1, False), #Move right.
+    (0, True), #Fire.
+    (-1, True), #Move left and fire.
+    (1, True), #Move right and fire.
+)
+
+
+def observation_spec(observation='state', frame_size=(84, 84), max_aliens=64, max_shots=16, **_):
+    """Return the (shape, dtype) of one environment's observations, without starting a game."""
+    if observation == 'state':
+        return (1 + 2 * (Settings().bullets_allowed + max_aliens + max_shots),), np.dtype(np.float32) #Ship x, then an (x, y) slot per bullet, alien and alien shot.
+    return (frame_size[1], frame_size[0], 3), np.dtype(np.uint8)
+
+
+class AlienInvasionEnv:
+    """A class to play the game one step at a time, Gym style, for training bots.
+
+    reset() starts a new game and step(action) plays frame_skip timesteps with
+    one of ACTIONS held down. Observations are either 'state', a float32 vector
+    (ship x, then x and y of each bullet, alien and alien shot, scaled to 0-1
+    and -1 for empty slots; the lowest shots come first), or 'pixels', a
+    downsampled (height, width, 3) uint8 frame drawn off-screen. The reward is the score gained during the step.
+    """
+
+    def __init__(self, observation='state', frame_size=(84, 84), frame_skip=4, max_aliens=64, max_shots=16,
+                 max_steps=10000, screen_size=None, observation_buffer=None):
+        """Make a headless game to play; observation_buffer, if given, is written to in place."""
+        if np is None:
+            raise ImportError("The environment needs NumPy installed.")
+        if observation not in ('state', 'pixels'):
+            raise ValueError(f"Unknown observation type {observation!r}.")
+        self.ai_game = AlienInvasion(headless=True, screen_size=screen_size)
+        self.settings = self.ai_game.settings
+        self.observation_type = observation
+        self.frame_skip = frame_skip
+        self.max_aliens = max_aliens #Aliens past this many are left out of the state vector.
+        self.max_shots = max_shots #Only the lowest alien shots, the ones closest to the ship, go in the state vector.
+        self.max_bullets = self.settings.bullets_allowed
+        self.max_steps = max_steps
+        self.steps = 0
+
+        self.observation_shape, self.observation_dtype = observation_spec(observation, frame_size, max_aliens, max_shots)
+        if observation == 'pixels':
+            self.frame = pygame.Surface(frame_size, 0, self.ai_game.screen) #Reused for every frame; smoothscale() draws straight into it, and needs it in the screen's format.
+        if observation_buffer is None:
+            observation_buffer = np.zeros(self.observation_shape, dtype=self.observation_dtype)
+        self.observation = observation_buffer #The same array is returned by every reset() and step(); copy it to keep one.
+
+    @property
+    def action_count(self):
+        """Return how many actions there are."""
+        return len(ACTIONS)
+
+    def reset(self, seed=None):
+        """Start a new game and return (observation, info); without a seed the game's generator carries on, as in Gym."""
+        ai_game = self.ai_game
+        if seed is not None: #Reseeding with None would make games after an automatic reset unrepeatable, now that the aliens' fire is random.
+            ai_game.seed = seed
+            ai_game.rng = random.Random(seed)
+        ai_game.frame = 0
+        ai_game.hit_pause = 0
+        ai_game.ship.moving_left = ai_game.ship.moving_right = False
+        ai_game.start_game()
+        self.steps = 0
+        return self._observe(), self._info()
+
+    def step(self, action):
+        """Hold action down for frame_skip timesteps; return (observation, reward, terminated, truncated, info)."""
+        ai_game = self.ai_game
+        direction, fire = ACTIONS[action]
+        ai_game.ship.moving_left = direction < 0
+        ai_game.ship.moving_right = direction > 0
+        if fire:
+            ai_game._fire_bullet()
+
+        score = ai_game.stats.score
+        for _ in range(self.frame_skip):
+            ai_game.advance()
+            if not ai_game.game_active:
+                break
+        self.steps += 1
+        reward = ai_game.stats.score - score
+        terminated = not ai_game.game_active #Game over.
+        truncated = not terminated and self.steps >= self.max_steps
+        return self._observe(), reward, terminated, truncated, self._info()
+
+    def _info(self):
+        """Return the game's statistics for the info dict."""
+        stats = self.ai_game.stats
+        return {'score': stats.score, 'level': stats.level, 'ships_left': stats.ships_left, 'frame': self.ai_game.frame}
+
+    def _observe(self):
+        """Write the current observation into self.observation and return it."""
+        if self.observation_type == 'state':
+            self._observe_state()
+        else:
+            self._observe_pixels()
+        return self.observation
+
+    def _observe_state(self):
+        """Fill the state vector from the ship, bullet, alien and alien shot positions."""
+        ai_game = self.ai_game
+        width, height = self.settings.screen_width, self.settings.screen_height
+        state = self.observation
+        state.fill(-1.0) #Empty slots read as -1.
+        state[0] = ai_game.ship.rect.centerx / width
+
+        bullets = ai_game.bullets.sprites()[:self.max_bullets]
+        if bullets:
+            positions = np.array([bullet.rect.center for bullet in bullets], dtype=np.float32) / (width, height)
+            state[1:1 + 2 * len(bullets)] = positions.ravel()
+
+        aliens = ai_game.aliens.sprites()[:self.max_aliens]
+        if aliens:
+            ai_game.sync_alien_rects()
+            start = 1 + 2 * self.max_bullets
+            positions = np.array([alien.rect.center for alien in aliens], dtype=np.float32) / (width, height)
+            state[start:start + 2 * len(aliens)] = positions.ravel()
+
+        shots = ai_game.alien_shots
+        if shots.count:
+            start = 1 + 2 * (self.max_bullets + self.max_aliens)
+            x, y = shots.x[:shots.count], shots.y[:shots.count]
+            lowest = np.argsort(-y, kind='stable')[:self.max_shots]
+            positions = np.stack(((x[lowest] + shots.width / 2) / width, (y[lowest] + shots.height / 2) / height), axis=1)
+            state[start:start + 2 * len(lowest)] = positions.ravel()
+
+    def _observe_pixels(self):
+        """Draw the frame off-screen, shrink it and copy it into the observation."""
+        self.ai_game.sync_alien_rects()
+        self.ai_game.draw_scene() #No display flip, so nothing is shown and no window is needed.
+        pygame.transform.smoothscale(self.ai_game.screen, self.frame.get_size(), self.frame)
+        np.copyto(self.observation, pygame.surfarray.pixels3d(self.frame).transpose(1, 0, 2)) #surfarray is (x, y); observations are (row, column).
+
+    def close(self):
+        """Stop the game's background threads."""
+        if self.ai_game.score_store:
+            self.ai_game.score_store.close()
+
+
+class SyncVectorEnv:
+    """A class to step several environments in lockstep in this process.
+
+    Observations come back stacked in one (num_envs, ...) array. A game that
+    ends is reset straight away; its final info is kept under 'final_info'.
+    """
+
+    def __init__(self, num_envs, **env_options):
+        """Make num_envs environments that write into one shared observation array."""
+        if np is None:
+            raise ImportError("The environment needs NumPy installed.")
+        shape, dtype = observation_spec(**env_options)
+        self.observations = np.zeros((num_envs,) + shape, dtype=dtype)
+        self.envs = [AlienInvasionEnv(observation_buffer=self.observations[index], **env_options) for index in range(num_envs)]
+        self.num_envs = num_envs
+        self.action_count = len(ACTIONS)
+
+    def reset(self, seed=None):
+        """Reset every environment (env i gets seed + i) and return (observations, infos)."""
+        infos = [env.reset(None if seed is None else seed + index)[1] for index, env in enumerate(self.envs)]
+        return self.observations, infos
+
+    def step(self, actions):
+        """Step every environment with its action; return (observations, rewards, terminated, truncated, infos)."""
+        rewards = np.zeros(self.num_envs, dtype=np.float64)
+        terminated = np.zeros(self.num_envs, dtype=bool)
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        infos = []
+        for index, (env, action) in enumerate(zip(self.envs, actions)):
+            _, rewards[index], terminated[index], truncated[index], info = env.step(int(action))
+            if terminated[index] or truncated[index]:
+                final_info = info
+                _, info = env.reset()
+                info['final_info'] = final_info
+            infos.append(info)
+        return self.observations, rewards, terminated, truncated, infos
+
+    def close(self):
+        """Close every environment."""
+        for env in self.envs:
+            env.close()
+
+
+def _subprocess_worker(pipe, memory_name, index, shape, dtype, env_options):
+    """Run one environment in a worker process, writing observations into shared memory."""
+    memory = shared_memory.SharedMemory(name=memory_name)
+    observations = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+    env = AlienInvasionEnv(observation_buffer=observations[index], **env_options)
+    while True:
+        command, value = pipe.recv()
+        if command == 'step':
+            _, reward, terminated, truncated, info = env.step(value)
+            if terminated or truncated:
+                final_info = info
+                _, info = env.reset()
+                info['final_info'] = final_info
+            pipe.send((reward, terminated, truncated, info))
+        elif command == 'reset':
+            pipe.send(env.reset(value)[1])
+        elif command == 'close':
+            break
+    env.close()
+    del env, observations #Arrays pointing into the shared memory have to go before it can close.
+    memory.close()
+
+
+class SubprocVectorEnv:
+    """A class to step environments in worker processes, one game per process.
+
+    Workers write observations straight into one shared-memory array, so only
+    actions, rewards and the small info dicts go through the pipes. Every
+    worker steps at once, which spreads the simulation over the CPU's cores.
+    """
+
+    def __init__(self, num_envs, start_method=None, **env_options):
+        """Start num_envs worker processes."""
+        if np is None:
+            raise ImportError("The environment needs NumPy installed.")
+        shape, dtype = observation_spec(**env_options)
+        shape = (num_envs,) + shape
+
+        self.memory = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * dtype.itemsize)
+        self.observations = np.ndarray(shape, dtype=dtype, buffer=self.memory.buf)
+        self.num_envs = num_envs
+        self.action_count = len(ACTIONS)
+
+        if start_method is None: #Forking a process that has already started pygame crashes the child, so start workers from a clean process.
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        context = multiprocessing.get_context(start_method)
+        self.pipes = []
+        self.processes = []
+        for index in range(num_envs):
+            parent_pipe, child_pipe = context.Pipe()
+            process = context.Process(target=_subprocess_worker,
+                                      args=(child_pipe, self.memory.name, index, shape, dtype, env_options), daemon=True)
+            process.start()
+            child_pipe.close()
+            self.pipes.append(parent_pipe)
+            self.processes.append(process)
+
+    def reset(self, seed=None):
+        """Reset every environment (env i gets seed + i) and return (observations, infos)."""
+        for index, pipe in enumerate(self.pipes):
+            pipe.send(('reset', None if seed is None else seed + index))
+        infos = [pipe.recv() for pipe in self.pipes]
+        return self.observations, infos
+
+    def step(self, actions):
+        """Step every environment with its action; return (observations, rewards, terminated, truncated, infos)."""
+        for pipe, action in zip(self.pipes, actions):
+            pipe.send(('step', int(action)))
+        results = [pipe.recv() for pipe in self.pipes] #Every worker steps in parallel; this waits for the slowest.
+        rewards = np.array([result[0] for result in results], dtype=np.float64)
+        terminated = np.array([result[1] for result in results], dtype=bool)
+        truncated = np.array([result[2] for result in results], dtype=bool)
+        return self.observations, rewards, terminated, truncated, [result[3] for result in results]
+
+    def close(self):
+        """Stop the workers and free the shared memory."""
+        for pipe in self.pipes:
+            try:
+                pipe.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self.processes:
+            process.join()
+        del self.observations
+        self.memory.close()
+        self.memory.unlink()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Measure how many environment steps per second random play gets.")
+    parser.add_argument('--envs', type=int, default=os.cpu_count() or 1, help="environments to step together")
+    parser.add_argument('--steps', type=int, default=1000, help="vector steps to time")
+    parser.add_argument('--observation', choices=('state', 'pixels'), default='state')
+    parser.add_argument('--subprocess', action='store_true', help="run each environment in its own process")
+    args = parser.parse_args()
+
+    vector_env = (SubprocVectorEnv if args.subprocess else SyncVectorEnv)(args.envs, observation=args.observation)
+    vector_env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    start = perf_counter()
+    for _ in range(args.steps):
+        vector_env.step(rng.integers(vector_env.action_count, size=args.envs))
+    elapsed = perf_counter() - start
+    vector_env.close()
+    samples = args.steps * args.envs
+    print(f"{samples} steps in {elapsed:.2f}s ({samples / elapsed:,.0f} steps/s)")
@@ -0,0 +1,162 @@
+try:
+    import numpy as np
+except ImportError: #NumPy is optional. Without it the game keeps using the per-sprite fleet update.
+    np = None
+
+
+class VectorFleet:
+    """A class to move every alien fleet with batched NumPy array operations.
+
+    All the fleets on screen share one set of arrays, with each alien tagged by
+    the index of its fleet, so several fleets cost one pass, not one per fleet.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the fleet arrays from the game's aliens group."""
+        if np is None:
+            raise ImportError("The 'numpy' fleet backend needs NumPy installed.")
+        self.settings = ai_game.settings
+        self.aliens = ai_game.aliens
+        self.sprites = []
+        self.rebuild()
+
+    def rebuild(self, new_wave=False):
+        """Copy the position and size of every alien into contiguous arrays.
+
+        Aliens already in the arrays carry on from where the arrays left them,
+        unless this is a new wave, whose aliens may be recycled from the old one.
+        """
+        if self.sprites and not new_wave:
+            self._write_back()
+        self.sprites = self.aliens.sprites() #The sprites are kept in the same order as the arrays, so index i of every array belongs to self.sprites[i].
+        count = len(self.sprites)
+        self.fleets = list(dict.fromkeys(alien.fleet for alien in self.sprites)) #Each fleet once, in the order its first alien appears.
+        fleet_numbers = {fleet: number for number, fleet in enumerate(self.fleets)}
+        self.fleet_index = np.fromiter((fleet_numbers[alien.fleet] for alien in self.sprites), dtype=np.intp, count=count)
+        self.x = np.fromiter((alien.x for alien in self.sprites), dtype=np.float64, count=count)
+        self.prev_x = self.x.copy() #Positions at the previous timestep, for drawing between timesteps.
+        self.y = np.fromiter((alien.rect.y for alien in self.sprites), dtype=np.float64, count=count)
+        self.width = np.fromiter((alien.rect.width for alien in self.sprites), dtype=np.int64, count=count)
+        self.height = np.fromiter((alien.rect.height for alien in self.sprites), dtype=np.int64, count=count)
+        self.synced = True #Whether the sprite rects show the simulated positions; update() moves only the arrays.
+
+    def _drop_dead_aliens(self):
+        """Remove array entries for aliens that have left the group some other way (e.g. a new wave)."""
+        if len(self.aliens) == len(self.sprites):
+            return
+        self._keep(np.fromiter((alien in self.aliens for alien in self.sprites), dtype=bool, count=len(self.sprites)))
+
+    def _keep(self, alive):
+        """Keep only the array entries where alive is True."""
+        self.sprites = [alien for alien, keep in zip(self.sprites, alive.tolist()) if keep]
+        self.x = self.x[alive]
+        self.fleet_index = self.fleet_index[alive]
+        self.prev_x = self.prev_x[alive]
+        self.y = self.y[alive]
+        self.width = self.width[alive]
+        self.height = self.height[alive]
+
+    def _write_back(self):
+        """Copy the simulated positions into the sprites the arrays still hold."""
+        self.interpolate(1.0)
+        for alien, x, prev_x in zip(self.sprites, self.x.tolist(), self.prev_x.tolist()):
+            alien.x = x
+            alien.prev_x = prev_x
+
+    def update(self):
+        """Check the edges, drop and turn the fleets that reached one, then move every fleet.
+
+        Only the arrays move. The sprite rects are written by interpolate(), once per drawn frame.
+        """
+        self._drop_dead_aliens()
+        self.synced = False
+        if not self.sprites:
+            return
+
+        # Edge checks use the integer rect positions, the same as Alien.check_edges(). Collisions below use them too.
+        left = _round(self.x)
+        at_edge = (left + self.width >= self.settings.screen_width) | (left <= 0)
+        if at_edge.any():
+            turning = np.zeros(len(self.fleets), dtype=bool)
+            turning[self.fleet_index[at_edge]] = True #A fleet turns if any of its aliens is at an edge.
+            drops = np.zeros(len(self.fleets))
+            for number in np.flatnonzero(turning).tolist():
+                fleet = self.fleets[number]
+                drops[number] = fleet.drop_speed
+                fleet.direction *= -1
+            self.y += drops[self.fleet_index]
+
+        velocity = np.array([fleet.velocity for fleet in self.fleets]) #One value per fleet, spread to its aliens by index.
+        self.prev_x[:] = self.x
+        self.x += velocity[self.fleet_index]
+
+    def _overlapping(self, left, top, rect):
+        """Return a mask of the aliens at left, top whose rects overlap rect, the same test as Rect.colliderect()."""
+        return ((left < rect.right) & (left + self.width > rect.left)
+                & (top < rect.bottom) & (top + self.height > rect.top))
+
+    def groupcollide(self, group):
+        """Work like pygame.sprite.groupcollide(group, aliens, True, True), testing against the arrays.
+
+        Each sprite in group is checked against the whole fleet in one array
+        operation. Aliens hit by an earlier sprite can't be hit by a later one.
+        """
+        self._drop_dead_aliens()
+        collisions = {}
+        if not self.sprites:
+            return collisions
+        left, top = _round(self.x), _round(self.y)
+        alive = np.ones(len(self.sprites), dtype=bool)
+        for sprite in group.sprites():
+            hit = self._overlapping(left, top, sprite.rect)
+            hit &= alive
+            if not hit.any():
+                continue
+            indexes = np.flatnonzero(hit).tolist()
+            alive[indexes] = False
+            hits = [self.sprites[index] for index in indexes]
+            for alien in hits:
+                alien.kill()
+            collisions[sprite] = hits
+            sprite.kill()
+        if collisions:
+            self._keep(alive)
+        return collisions
+
+    def collides(self, rect):
+        """Return True if any alien overlaps rect."""
+        self._drop_dead_aliens()
+        left, top = _round(self.x), _round(self.y)
+        return bool(self._overlapping(left, top, rect).any())
+
+    def shooter_position(self, index):
+        """Return (centerx, bottom) of the alien at index, where an alien shot starts."""
+        left, top = _round(np.array((self.x[index], self.y[index]))).tolist()
+        return left + int(self.width[index]) // 2, top + int(self.height[index])
+
+    def interpolate(self, alpha=1.0):
+        """Write the fleet to the sprite rects, alpha of the way from the previous to the current x, for drawing.
+
+        This is the only place the rects are written, so it costs one pass per
+        drawn frame rather than one per timestep.
+        """
+        self._drop_dead_aliens()
+        draw_x = self.x if alpha >= 1.0 else self.prev_x + (self.x - self.prev_x) * alpha
+        for alien, x, y in zip(self.sprites, _round(draw_x).tolist(), _round(self.y).tolist()):
+            alien.rect.topleft = x, y
+        self.synced = alpha >= 1.0
+
+    def sync_rects(self):
+        """Bring the sprite rects up to the simulated positions, for code that reads them between frames."""
+        if not self.synced:
+            self.interpolate(1.0)
+
+    def reached_bottom(self):
+        """Return True if any alien has reached the bottom of the screen."""
+        self._drop_dead_aliens()
+        return bool((_round(self.y) + self.height >= self.settings.screen_height).any())
+
+
+def _round(values):
+    """Round values to whole pixels the way pygame does, halves away from zero, as integers."""
+    return np.where(values >= 0, np.floor(values + 0.5), np.ceil(values - 0.5)).astype(np.int64)
@@ -0,0 +1,78 @@
+import os
+from functools import lru_cache
+
+
+def _count(limit, start, step):
+    """Return how many of start, start + step, start + 2*step, ... are less than limit."""
+    if limit <= start:
+        return 0
+    return (limit - start + step - 1) // step
+
+
+def grid_layout(screen_width, screen_height, alien_width, alien_height):
+    """Return the fleet as rows of (x, y) positions, one alien width and height apart."""
+    # Same grid the original nested while loops walked: columns start one alien width in and stop two widths short of the right edge; rows stop three heights short of the bottom.
+    columns = _count(screen_width - 2 * alien_width, alien_width, 2 * alien_width)
+    rows = _count(screen_height - 3 * alien_height, alien_height, 2 * alien_height)
+    xs = [alien_width + 2 * alien_width * column for column in range(columns)]
+    return [[(x, alien_height + 2 * alien_height * row) for x in xs] for row in range(rows)]
+
+
+def staggered_layout(screen_width, screen_height, alien_width, alien_height):
+    """Return a grid where every other row is shifted right by one alien width."""
+    rows = grid_layout(screen_width, screen_height, alien_width, alien_height)
+    max_x = screen_width - 2 * alien_width
+    return [[(x + alien_width, y) for x, y in row if x + alien_width < max_x] if index % 2 else row
+            for index, row in enumerate(rows)]
+
+
+def pattern_layout(path, screen_width, screen_height, alien_width, alien_height):
+    """Return the aliens marked in a text pattern file, one character per grid cell.
+
+    Any character other than a space or '.' places an alien. Cells use the
+    same spacing as the grid, and cells that would fall off screen are dropped.
+    """
+    max_x = screen_width - 2 * alien_width
+    max_y = screen_height - 3 * alien_height
+    rows = []
+    with open(path) as file:
+        for row, line in enumerate(file.read().splitlines()):
+            y = alien_height + 2 * alien_height * row
+            if y >= max_y:
+                break
+            positions = [(alien_width + 2 * alien_width * column, y)
+                         for column, char in enumerate(line) if char not in ' .']
+            rows.append([(x, y) for x, y in positions if x < max_x])
+    return rows
+
+
+@lru_cache(maxsize=32)
+def _cached_layout(formation, pattern, screen_size, alien_size):
+    """Compute a layout once per formation, pattern file version, screen size and alien size."""
+    if formation == 'grid':
+        rows = grid_layout(*screen_size, *alien_size)
+    elif formation == 'staggered':
+        rows = staggered_layout(*screen_size, *alien_size)
+    elif formation == 'pattern':
+        rows = pattern_layout(pattern[0], *screen_size, *alien_size)
+    else:
+        raise ValueError(f"Unknown fleet formation {formation!r}.")
+    return tuple(tuple(row) for row in rows if row)
+
+
+def fleet_layout(settings, alien_size, formation=None, pattern_path=None, area=None):
+    """Return the rows of alien positions for a formation (default: the one chosen in settings).
+
+    area is an (x, y, width, height) part of the screen to lay the fleet out
+    in, so several fleets can share the screen; by default it's the whole screen.
+    """
+    formation = formation or settings.fleet_formation
+    pattern_path = pattern_path or settings.fleet_pattern_path
+    x, y, width, height = area or (0, 0, settings.screen_width, settings.screen_height)
+    pattern = None
+    if formation == 'pattern':
+        pattern = (pattern_path, os.stat(pattern_path).st_mtime_ns) #Editing the file gives it a new cache entry.
+    rows = _cached_layout(formation, pattern, (width, height), tuple(alien_size))
+    if x or y: #The cached layout starts at the top left of the area; move it into place.
+        rows = tuple(tuple((alien_x + x, alien_y + y) for alien_x, alien_y in row) for row in rows)
+    return rows
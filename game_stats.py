@@ -1,15 +1,42 @@
-class GameStats:
-    """Track statistics for Alien Invasion."""
-
-    def __init__(self, ai_game):
-        """Initialize statistics."""
-        self.settings = ai_game.settings
-        self.reset_stats() #we’ll need to reset some statistics each time the player starts a new game. To do this, we’ll initialize most of the statistics in the reset_stats() method, instead of directly in __init__(). We’ll call this method from __init__() so the statistics are set properly when the GameStats instance is first created. But we’ll also be able to call reset_stats() anytime the player starts a new game. 
-        #Because the high score should never be reset, we initialize high_score in __init__() rather than in reset_stats().
-        self.high_score = 0
-
-    def reset_stats(self):
-        """Initialize statistics that can change during the game."""
-        self.ships_left = self.settings.ship_limit
-        self.score = 0
+def _stat(name):
+    """Return a property that stores a statistic and tells the listeners when its value changes."""
+    attribute = '_' + name
+
+    def get(self):
+        return getattr(self, attribute)
+
+    def set(self, value):
+        if getattr(self, attribute, None) != value: #Setting a statistic to the value it already has isn't a change.
+            setattr(self, attribute, value)
+            for listener in self.listeners:
+                listener(name)
+
+    return property(get, set)
+
+
+class GameStats:
+    """Track statistics for Alien Invasion."""
+
+    # Each statistic announces its changes, so the scoreboard only redraws what actually changed.
+    score = _stat('score')
+    high_score = _stat('high_score')
+    level = _stat('level')
+    ships_left = _stat('ships_left')
+
+    def __init__(self, ai_game):
+        """Initialize statistics."""
+        self.settings = ai_game.settings
+        self.listeners = [] #Functions called with a statistic's name whenever its value changes.
+        self.reset_stats() #we’ll need to reset some statistics each time the player starts a new game. To do this, we’ll initialize most of the statistics in the reset_stats() method, instead of directly in __init__(). We’ll call this method from __init__() so the statistics are set properly when the GameStats instance is first created. But we’ll also be able to call reset_stats() anytime the player starts a new game. 
+        #Because the high score should never be reset, we initialize high_score in __init__() rather than in reset_stats().
+        self.high_score = 0 #AlienInvasion raises this to the best saved score once the score store has loaded it in the background.
+
+    def subscribe(self, listener):
+        """Call listener(name) whenever the statistic called name changes value."""
+        self.listeners.append(listener)
+
+    def reset_stats(self):
+        """Initialize statistics that can change during the game."""
+        self.ships_left = self.settings.ship_limit
+        self.score = 0
         self.level = 1
\ No newline at end of file
@@ -0,0 +1,71 @@
+import pygame
+
+
+class GlyphAtlas:
+    """A class to render each glyph (or fixed label) once and reuse the image."""
+
+    def __init__(self, font, text_color, bg_color):
+        """Initialize an empty atlas for one font and colour pair."""
+        self.font = font
+        self.text_color = text_color
+        self.bg_color = bg_color
+        self.glyphs = {}
+        self.height = font.get_height()
+
+    def glyph(self, text):
+        """Return the rendered image of text, rendering it only the first time."""
+        image = self.glyphs.get(text)
+        if image is None:
+            image = self.glyphs[text] = self.font.render(text, True, self.text_color, self.bg_color)
+        return image
+
+    def preload(self, chars):
+        """Render every character in chars up front."""
+        for char in chars:
+            self.glyph(char)
+
+    def width(self, text):
+        """Return the width of text when built from single-character glyphs."""
+        return sum(self.glyph(char).get_width() for char in text)
+
+
+class TextLine:
+    """A class to show a fixed label and a changing value on one reused Surface."""
+
+    def __init__(self, atlas, label, align='left'):
+        """Initialize the line; the image is built by the first set_value() call."""
+        self.atlas = atlas
+        self.label = label
+        self.align = align #Where the text sits inside the image: 'left', 'center' or 'right'.
+        self.value = None
+        self.image = None
+        self.rect = pygame.Rect(0, 0, 0, 0)
+        atlas.preload('0123456789,')
+
+    def set_value(self, value):
+        """Show value after the label, blitting cached glyphs into the existing image."""
+        if value == self.value:
+            return
+        self.value = value
+        label_image = self.atlas.glyph(self.label)
+        text_width = label_image.get_width() + self.atlas.width(value)
+
+        if self.image is None or text_width > self.image.get_width():
+            # Only allocate when the text outgrows the image, with room for a few more digits.
+            spare = 4 * self.atlas.glyph('0').get_width()
+            self.image = pygame.Surface((text_width + spare, self.atlas.height))
+            self.rect.size = self.image.get_size()
+
+        self.image.fill(self.atlas.bg_color)
+        if self.align == 'right':
+            x = self.image.get_width() - text_width
+        elif self.align == 'center':
+            x = (self.image.get_width() - text_width) // 2
+        else:
+            x = 0
+        self.image.blit(label_image, (x, 0))
+        x += label_image.get_width()
+        for char in value:
+            glyph = self.atlas.glyph(char)
+            self.image.blit(glyph, (x, 0))
+            x += glyph.get_width()
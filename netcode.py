@@ -0,0 +1,316 @@
+import struct
+from array import array
+from time import perf_counter
+
+import pygame
+
+# Every message is a FRAME (body length, message type) followed by its body.
+FRAME = struct.Struct('<IB')
+MAX_FRAME = 1 << 20 #Longest body accepted. A full snapshot of the biggest wave is a few kilobytes; anything near this is a bad stream.
+HELLO = 0 #Server to client. The body is JSON: which player the client is, and what it needs to draw the game.
+INPUT = 1 #Client to server. The body is INPUT_BODY.
+SNAPSHOT = 2 #Server to client. The body is SNAPSHOT_HEADER, then the game state delta-encoded against the last snapshot.
+
+INPUT_BODY = struct.Struct('<IB') #input sequence number, buttons
+SNAPSHOT_HEADER = struct.Struct('<II') #tick, sequence number of the last input from this client that has been applied
+
+# Buttons, as bits of an INPUT message. LEFT and RIGHT are held; FIRE and START happen once per message.
+LEFT = 1
+RIGHT = 2
+FIRE = 4
+START = 8 #Start a new game if one isn't running, like clicking Play.
+
+# A snapshot is one int array per section, in this order:
+#   header:  score, level, ships left, game active
+#   ships:   x, y of each player's ship
+#   bullets: x, y per bullet slot
+#   aliens:  x, y, kind per alien slot (kind indexes the image paths sent in HELLO)
+#   shots:   x, y of each alien shot
+SECTIONS = ('header', 'ships', 'bullets', 'aliens', 'shots')
+EMPTY = -32768 #Every value of a free slot.
+
+
+def empty_snapshot():
+    """Return a snapshot with nothing in it, the baseline a new client starts from."""
+    return tuple(array('q') for _ in SECTIONS)
+
+
+def pack_message(kind, body):
+    """Return body framed as a message of type kind."""
+    return FRAME.pack(len(body), kind) + body
+
+
+async def read_message(reader):
+    """Read one message from an asyncio StreamReader; return (type, body).
+
+    Raise ConnectionError if the frame claims a body longer than MAX_FRAME.
+    """
+    length, kind = FRAME.unpack(await reader.readexactly(FRAME.size))
+    if length > MAX_FRAME:
+        raise ConnectionError(f"A {length}-byte message is longer than the {MAX_FRAME}-byte limit.")
+    return kind, await reader.readexactly(length)
+
+
+def _write_varint(out, value):
+    """Append value to out as a zigzag varint, so small numbers of either sign take one byte."""
+    value = value * 2 if value >= 0 else -value * 2 - 1
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    """Return (value, position after it) for the zigzag varint at data[pos]."""
+    value = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            break
+        shift += 7
+    return (value >> 1) if not value & 1 else -(value >> 1) - 1, pos
+
+
+def encode_delta(baseline, snapshot):
+    """Return snapshot encoded as the changes from baseline.
+
+    For each section: its length, then how many of the values it shares with
+    baseline changed, which ones (a bitmask when many did, otherwise the gaps
+    between their indexes), and the change in each; then any values past the
+    end of baseline in full. Everything is a varint, so a fleet that moved a
+    pixel costs about a byte per alien and a section that didn't change costs
+    two bytes.
+    """
+    out = bytearray()
+    for old, new in zip(baseline, snapshot):
+        _write_varint(out, len(new))
+        common = min(len(old), len(new))
+        changed = [index for index in range(common) if new[index] != old[index]]
+        _write_varint(out, len(changed))
+        if changed:
+            if len(changed) * 8 > common: #Dense: one bit per shared value is smaller than a gap per change.
+                mask = bytearray((common + 7) // 8)
+                for index in changed:
+                    mask[index >> 3] |= 1 << (index & 7)
+                out += mask
+            else:
+                previous = -1
+                for index in changed:
+                    _write_varint(out, index - previous)
+                    previous = index
+            for index in changed:
+                _write_varint(out, new[index] - old[index])
+        for value in new[common:]:
+            _write_varint(out, value)
+    return bytes(out)
+
+
+def decode_delta(baseline, data, pos=0):
+    """Return the snapshot encode_delta() encoded against baseline from data[pos:]."""
+    snapshot = []
+    for old in baseline:
+        length, pos = _read_varint(data, pos)
+        common = min(len(old), length)
+        new = old[:common]
+        count, pos = _read_varint(data, pos)
+        if count:
+            if count * 8 > common:
+                mask = data[pos:pos + (common + 7) // 8]
+                pos += len(mask)
+                changed = [index for index in range(common) if mask[index >> 3] >> (index & 7) & 1]
+            else:
+                changed = []
+                index = -1
+                for _ in range(count):
+                    gap, pos = _read_varint(data, pos)
+                    index += gap
+                    changed.append(index)
+            for index in changed:
+                change, pos = _read_varint(data, pos)
+                new[index] += change
+        for _ in range(length - common):
+            value, pos = _read_varint(data, pos)
+            new.append(value)
+        snapshot.append(new)
+    return tuple(snapshot)
+
+
+class SlotTable:
+    """A class to give sprites slots that stay the same while they're alive.
+
+    Slots are what keep snapshot deltas small: a bullet or alien keeps its place
+    in the arrays, so removing one doesn't shift everything after it.
+    """
+
+    def __init__(self):
+        """Initialize an empty table."""
+        self.slots = [] #The sprite in each slot, or None.
+        self.slot_of = {} #sprite -> slot
+
+    def update(self, sprites):
+        """Free the slots of sprites that are gone, give new ones the lowest free slots, and return the slots."""
+        slots, slot_of = self.slots, self.slot_of
+        alive = set(sprites)
+        for sprite in [sprite for sprite in slot_of if sprite not in alive]:
+            slots[slot_of.pop(sprite)] = None
+        free = [index for index in range(len(slots) - 1, -1, -1) if slots[index] is None] #Highest first, so pop() hands out the lowest.
+        for sprite in sprites:
+            if sprite not in slot_of:
+                slot = free.pop() if free else len(slots)
+                if slot == len(slots):
+                    slots.append(None)
+                slots[slot] = sprite
+                slot_of[sprite] = slot
+        while slots and slots[-1] is None: #Shrink after a wave is cleared.
+            slots.pop()
+        return slots
+
+
+class SnapshotWriter:
+    """A class to capture the server's game as a snapshot each tick."""
+
+    def __init__(self, ai_game):
+        """Initialize the slot tables and number the alien images."""
+        self.ai_game = ai_game
+        self.image_paths = ai_game.waves.image_paths()
+        self.kinds = {id(ai_game.assets.load_image(path)): kind for kind, path in enumerate(self.image_paths)} #Aliens share the cached Surfaces, so the Surface tells us the kind.
+        self.bullet_slots = SlotTable()
+        self.alien_slots = SlotTable()
+
+    def capture(self):
+        """Return the game's current state as a snapshot."""
+        ai_game = self.ai_game
+        ai_game.sync_alien_rects()
+        stats = ai_game.stats
+        header = array('q', (stats.score, stats.level, stats.ships_left, ai_game.game_active))
+
+        ships = array('q')
+        for ship in ai_game.ships:
+            ships.extend(ship.rect.topleft)
+
+        bullets = array('q')
+        for bullet in self.bullet_slots.update(ai_game.bullets.sprites()):
+            bullets.extend(bullet.rect.topleft if bullet else (EMPTY, EMPTY))
+
+        aliens = array('q')
+        kinds = self.kinds
+        for alien in self.alien_slots.update(ai_game.aliens.sprites()):
+            if alien:
+                aliens.extend((alien.rect.x, alien.rect.y, kinds.get(id(alien.image), 0)))
+            else:
+                aliens.extend((EMPTY, EMPTY, EMPTY))
+
+        shots = array('q')
+        for rect in ai_game.alien_shots.rects():
+            shots.extend(rect.topleft)
+        return header, ships, bullets, aliens, shots
+
+
+class SnapshotReader:
+    """A class to decode snapshots and pose a client's game to match them.
+
+    The client's game never advances; its sprites are just moved to where the
+    server says they are, and then drawn the usual way.
+    """
+
+    def __init__(self, ai_game, image_paths):
+        """Take over ai_game's sprites; image_paths are the alien kinds, from HELLO."""
+        self.ai_game = ai_game
+        self.images = [ai_game.assets.load_image(path) for path in image_paths]
+        self.baseline = empty_snapshot()
+        self.bullets = [] #The Bullet in each slot, or None.
+        self.aliens = [] #The Alien in each slot, or None.
+        ai_game.alien_pool.release_all(ai_game.aliens) #Drop the fleet the game built for itself; the server's arrives in the first snapshot.
+
+    def apply(self, data, pos=0):
+        """Decode the snapshot in data[pos:] and move the game's sprites to match it."""
+        self.baseline = header, ships, bullets, aliens, shots = decode_delta(self.baseline, data, pos)
+        ai_game = self.ai_game
+        stats = ai_game.stats
+        stats.score, stats.level, stats.ships_left = header[0], header[1], header[2] #The scoreboard hears about any changes, as in a local game.
+        if ai_game.game_active != bool(header[3]):
+            ai_game.game_active = bool(header[3])
+            pygame.mouse.set_visible(not ai_game.game_active) #Show the cursor to click Play between games.
+
+        for index, ship in enumerate(ai_game.ships):
+            ship.rect.topleft = ships[2 * index], ships[2 * index + 1]
+            ship.x = ship.prev_x = float(ship.rect.x)
+
+        self._pose(self.bullets, bullets, 2, ai_game.bullet_pool, ai_game.bullets)
+        self._pose(self.aliens, aliens, 3, ai_game.alien_pool, ai_game.aliens)
+
+        alien_shots = ai_game.alien_shots
+        count = min(len(shots) // 2, alien_shots.capacity)
+        for index in range(count):
+            alien_shots.x[index] = shots[2 * index]
+            alien_shots.y[index] = alien_shots.prev_y[index] = shots[2 * index + 1]
+        alien_shots.count = count
+
+    def _pose(self, sprites, values, stride, pool, group):
+        """Fill, move or free each slot's sprite from values, stride values per slot."""
+        slots = len(values) // stride
+        while len(sprites) > slots:
+            sprite = sprites.pop()
+            if sprite:
+                pool.release(sprite)
+        sprites.extend([None] * (slots - len(sprites)))
+        for slot in range(slots):
+            x = values[slot * stride]
+            sprite = sprites[slot]
+            if x == EMPTY:
+                if sprite:
+                    pool.release(sprite)
+                    sprites[slot] = None
+                continue
+            if sprite is None:
+                sprite = sprites[slot] = pool.acquire()
+                group.add(sprite)
+            if stride == 3: #Aliens also carry their kind.
+                image = self.images[values[slot * stride + 2]]
+                if sprite.image is not image:
+                    sprite.image = image
+                    sprite.rect.size = image.get_size()
+            sprite.rect.topleft = x, values[slot * stride + 1]
+
+
+class NetCounters:
+    """A class to count ticks, messages and bytes, for tick-rate and bandwidth reports."""
+
+    def __init__(self):
+        """Start counting from now."""
+        self.reset()
+
+    def reset(self):
+        """Zero the counters and restart the clock."""
+        self.started = perf_counter()
+        self.ticks = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.skipped = 0 #Snapshots not sent because a client wasn't keeping up.
+
+    def summary(self):
+        """Return the rates since the last reset as a dict."""
+        seconds = max(perf_counter() - self.started, 1e-9)
+        ticks = max(self.ticks, 1)
+        return {
+            'seconds': seconds,
+            'ticks': self.ticks,
+            'tick_rate': self.ticks / seconds,
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'bytes_sent_per_tick': self.bytes_sent / ticks,
+            'bytes_received_per_tick': self.bytes_received / ticks,
+            'kbit_per_second': (self.bytes_sent + self.bytes_received) * 8 / 1000 / seconds,
+            'skipped': self.skipped,
+        }
+
+    def report(self):
+        """Return a one-line summary."""
+        summary = self.summary()
+        return (f"{summary['tick_rate']:.1f} ticks/s  sent {summary['bytes_sent_per_tick']:.1f} B/tick  "
+                f"received {summary['bytes_received_per_tick']:.1f} B/tick  {summary['kbit_per_second']:.1f} kbit/s  "
+                f"skipped {summary['skipped']}")
@@ -0,0 +1,36 @@
+class SpritePool:
+    """A class to recycle sprites instead of building new ones."""
+
+    def __init__(self, factory):
+        """Initialize an empty pool that builds new sprites with factory()."""
+        self.factory = factory
+        self.free = [] #Sprites that have been released and are waiting to be reused.
+        self.allocations = 0 #Sprites built because the pool was empty. This stops going up once the game reaches a steady state.
+        self.reuses = 0
+        self.releases = 0
+
+    def acquire(self, *args):
+        """Return a sprite from the pool (or a new one), reset with args."""
+        if self.free:
+            sprite = self.free.pop()
+            self.reuses += 1
+        else:
+            sprite = self.factory()
+            sprite.pool = self
+            self.allocations += 1
+        sprite.pooled = False
+        sprite.reset(*args)
+        return sprite
+
+    def release(self, sprite):
+        """Take sprite out of its groups and keep it for reuse."""
+        sprite.kill()
+        if not sprite.pooled: #A sprite can be released from more than one place in a frame, but must only go back in the pool once.
+            sprite.pooled = True
+            self.free.append(sprite)
+            self.releases += 1
+
+    def release_all(self, group):
+        """Release every sprite in group."""
+        for sprite in group.sprites():
+            self.release(sprite)
@@ -0,0 +1,127 @@
+import csv
+import json
+from array import array
+from time import perf_counter
+
+# The parts of a frame that get timed, in the order they run.
+PHASES = ('check_events', 'ship_update', 'update_bullets', 'bullet_alien_collisions',
+          'update_aliens', 'alien_shots', 'update_screen')
+
+
+class FrameProfiler:
+    """A class to time each phase of every frame in a fixed-size ring buffer."""
+
+    def __init__(self, ai_game, size=1024):
+        """Initialize the ring buffers and the overlay."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.size = size #Only the most recent size frames are kept, so profiling never grows memory.
+        self.samples = {phase: array('d', bytes(8 * size)) for phase in PHASES} #Seconds spent in each phase, one slot per frame.
+        self.frame_work = array('d', bytes(8 * size)) #Seconds from the start of the frame to the end of drawing.
+        self.frame_interval = array('d', bytes(8 * size)) #Seconds from the start of one frame to the start of the next, including clock.tick().
+        self.index = 0
+        self.count = 0
+        self._frame_start = None
+        self._last = 0.0
+
+        self.font = ai_game.assets.load_font(None, 24)
+        self.text_color = (200, 0, 0)
+        self.overlay_image = None
+        self.overlay_rect = None
+
+    @property
+    def enabled(self):
+        """Return True if frames are being timed."""
+        return self.settings.profile_frames or self.settings.show_profiler
+
+    def begin_frame(self):
+        """Mark the start of a frame."""
+        if not self.enabled:
+            return
+        now = perf_counter()
+        if self._frame_start is not None:
+            self.frame_interval[self.index] = now - self._frame_start
+        for phase_samples in self.samples.values(): #Phases that don't run this frame (e.g. while the game is paused) should read as zero, not as an old value.
+            phase_samples[self.index] = 0.0
+        self._frame_start = self._last = now
+
+    def lap(self, phase):
+        """Add the time since the last mark to phase."""
+        if self._frame_start is None:
+            return
+        now = perf_counter()
+        self.samples[phase][self.index] += now - self._last #A frame can run several timesteps, so the simulation phases add up.
+        self._last = now
+
+    def end_frame(self):
+        """Finish the frame's record and move on to the next slot."""
+        if self._frame_start is None:
+            return
+        self.frame_work[self.index] = perf_counter() - self._frame_start
+        self.index = (self.index + 1) % self.size
+        self.count += 1
+        if not self.enabled:
+            self._frame_start = None
+
+    def _recent(self, samples):
+        """Return the filled slots of a ring buffer, oldest first."""
+        if self.count < self.size:
+            return samples[:self.count]
+        return samples[self.index:] + samples[:self.index]
+
+    @staticmethod
+    def _percentile(values, fraction):
+        """Return the value fraction of the way through values, once sorted."""
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        return ordered[int(fraction * (len(ordered) - 1))]
+
+    def summary(self):
+        """Return FPS, frame-time percentiles (ms) and mean time per phase (ms)."""
+        work = self._recent(self.frame_work)
+        intervals = [interval for interval in self._recent(self.frame_interval) if interval]
+        fps = len(intervals) / sum(intervals) if intervals else 0.0
+        return {
+            'frames': self.count,
+            'fps': fps,
+            'p50_ms': self._percentile(work, 0.50) * 1000,
+            'p99_ms': self._percentile(work, 0.99) * 1000,
+            'phases_ms': {phase: (sum(self._recent(samples)) / len(work) * 1000 if work else 0.0)
+                          for phase, samples in self.samples.items()},
+        }
+
+    def prep_overlay(self):
+        """Re-render the overlay text a few times a second."""
+        if self.overlay_image is not None and self.count % self.settings.profiler_overlay_interval:
+            return
+        summary = self.summary()
+        text = (f"FPS {summary['fps']:.1f}  p50 {summary['p50_ms']:.2f} ms  p99 {summary['p99_ms']:.2f} ms  "
+                f"aliens {len(self.ai_game.aliens)}  bullets {len(self.ai_game.bullets)}  shots {len(self.ai_game.alien_shots)}")
+        self.overlay_image = self.font.render(text, True, self.text_color, self.settings.bg_colour)
+        self.overlay_rect = self.overlay_image.get_rect()
+        self.overlay_rect.bottomleft = (10, self.settings.screen_height - 10)
+
+    def draw_overlay(self):
+        """Draw the overlay in the bottom-left corner of the screen."""
+        self.prep_overlay()
+        self.ai_game.screen.blit(self.overlay_image, self.overlay_rect)
+
+    def dump(self, path):
+        """Write the recorded frames to path, as CSV if it ends in .csv and JSON otherwise."""
+        columns = {phase: self._recent(samples) for phase, samples in self.samples.items()}
+        columns['frame_work'] = self._recent(self.frame_work)
+        columns['frame_interval'] = self._recent(self.frame_interval)
+        if path.endswith('.csv'):
+            with open(path, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(['frame'] + list(columns))
+                first_frame = self.count - len(columns['frame_work'])
+                for row, values in enumerate(zip(*columns.values())):
+                    writer.writerow([first_frame + row] + [f"{value * 1000:.4f}" for value in values])
+        else:
+            with open(path, 'w') as file:
+                json.dump({'summary': self.summary(),
+                           'samples_ms': {name: [round(value * 1000, 4) for value in values]
+                                          for name, values in columns.items()}},
+                          file, indent=1)
@@ -0,0 +1,132 @@
+import pygame
+
+class DirtyRenderer:
+    """A class to redraw only the parts of the screen that changed since the last frame.
+
+    Aliens are erased and pushed as one strip per fleet row. A frame whose
+    changes cover more than settings.dirty_max_fraction of the screen is
+    drawn in full instead.
+    """
+
+    def __init__(self, ai_game):
+        """Initialize the renderer and the rects it remembers between frames."""
+        self.ai_game = ai_game
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.screen_rect = self.screen.get_rect()
+
+        self.bullet_rects = [] #Where each bullet was drawn last frame.
+        self.shot_rects = [] #Where each alien shot was drawn last frame.
+        self.ship_rects = [] #Where each ship was drawn last frame.
+        self.alien_rows = {} #Maps the top of each row of aliens drawn last frame to one rect around the row.
+        self.hud = [] #(image, rect) for every scoreboard item drawn last frame.
+        self.hud_revision = None #The scoreboard's revision when it was last drawn.
+        self.hud_overlay = None #The profiler overlay image when it was last drawn.
+        self.button_shown = False
+        self.full_redraw = True #The first frame (and the first after switching modes) has to draw everything.
+        self.dirty_area = 0 #Pixels the last frame changed, or would have changed had it been drawn in rects.
+        self.max_dirty_area = self.settings.dirty_max_fraction * self.screen_rect.width * self.screen_rect.height
+
+    def invalidate(self):
+        """Redraw the whole screen on the next frame."""
+        self.full_redraw = True
+
+    def _current_hud(self, overlay):
+        """Return (image, rect) for every scoreboard item that should be on screen."""
+        sb = self.ai_game.sb
+        hud = [(sb.score_image, sb.score_rect), (sb.high_score_image, sb.high_score_rect),
+               (sb.level_image, sb.level_rect)]
+        hud.extend((ship.image, ship.rect) for ship in sb.ships)
+        if overlay:
+            hud.append((overlay, self.ai_game.profiler.overlay_rect))
+        return hud
+
+    def draw(self):
+        """Draw the frame and push only the changed rects; return the number of pixels pushed."""
+        ai_game = self.ai_game
+        screen = self.screen
+        sb = ai_game.sb
+        sb.refresh() #Redraw any scoreboard images whose statistics changed since the last frame.
+        overlay = None
+        if self.settings.show_profiler:
+            ai_game.profiler.prep_overlay()
+            overlay = ai_game.profiler.overlay_image #A new Surface whenever the overlay text changes.
+        hud_changed = sb.revision != self.hud_revision or overlay is not self.hud_overlay #Score images are redrawn in place, so the revision says when they changed.
+        hud = self._current_hud(overlay) if hud_changed else self.hud
+        show_button = not ai_game.game_active
+
+        # A frame that changes much of the screen (e.g. a big fleet moving) is cheaper to draw in full than rect by rect.
+        full_redraw = self.full_redraw or self.dirty_area > self.max_dirty_area
+
+        # Erase everything that moves, plus scoreboard items that changed and the button if it has just been hidden.
+        erased = self.bullet_rects + self.shot_rects + self.ship_rects
+        if hud_changed:
+            erased.extend(rect for _, rect in self.hud) #Clear the old items in case a new image is smaller than the one it replaces.
+        if self.button_shown and not show_button:
+            erased.append(ai_game.play_button.rect.copy())
+        if full_redraw:
+            screen.fill(self.settings.bg_colour)
+        else:
+            for rect in erased:
+                screen.fill(self.settings.bg_colour, rect)
+            for rect in self.alien_rows.values(): #Every alien drawn last frame, including aliens that have since been removed.
+                screen.fill(self.settings.bg_colour, rect)
+
+        # Draw everything that moves, in the same order as the full renderer.
+        dirty = list(erased)
+        self.bullet_rects = []
+        for bullet in ai_game.bullets.sprites():
+            bullet.draw_bullet()
+            self.bullet_rects.append(bullet.rect.copy())
+        dirty.extend(self.bullet_rects)
+        self.shot_rects = ai_game.alien_shots.draw() #A fresh Rect per shot, so they can be kept as they are.
+        dirty.extend(self.shot_rects)
+
+        self.ship_rects = []
+        for ship in ai_game.ships:
+            ship.blitme()
+            self.ship_rects.append(ship.rect.copy())
+        dirty.extend(self.ship_rects)
+
+        # A fleet moves sideways in rows, so the aliens are erased and pushed one strip per row, not two rects per alien.
+        ai_game.aliens.draw(screen)
+        rows = {}
+        for alien in ai_game.aliens.sprites():
+            rect = alien.rect
+            row = rows.get(rect.y)
+            if row is None:
+                rows[rect.y] = rect.copy()
+            else:
+                row.union_ip(rect)
+        changed = dict(rows)
+        for y, rect in self.alien_rows.items(): #Each strip also covers where its row was last frame.
+            changed[y] = changed[y].union(rect) if y in changed else rect
+        dirty.extend(changed.values())
+        self.alien_rows = rows
+
+        # Redraw scoreboard items that changed or that something was drawn over.
+        for image, rect in hud:
+            if full_redraw or hud_changed or rect.collidelist(dirty) != -1:
+                screen.blit(image, rect)
+                dirty.append(rect)
+        if hud_changed:
+            self.hud = [(image, rect.copy()) for image, rect in hud]
+            self.hud_revision = sb.revision
+            self.hud_overlay = overlay
+
+        # The button always goes on top.
+        button_rect = ai_game.play_button.rect
+        if show_button and (full_redraw or not self.button_shown or button_rect.collidelist(dirty) != -1):
+            ai_game.play_button.draw_button()
+            dirty.append(button_rect.copy())
+        self.button_shown = show_button
+
+        dirty = [rect.clip(self.screen_rect) for rect in dirty]
+        self.dirty_area = sum(rect.width * rect.height for rect in dirty) #Counted in full frames too, to know when rects pay off again.
+        if full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+            return self.screen_rect.width * self.screen_rect.height
+
+        pygame.display.update(dirty)
+        return self.dirty_area
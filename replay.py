@@ -0,0 +1,103 @@
+import argparse
+import struct
+from time import perf_counter
+
+import pygame
+
+MAGIC = b'AIRP'
+VERSION = 1
+HEADER = struct.Struct('<4sHqII') #magic, version, seed, screen width, screen height
+RECORD = struct.Struct('<IBii') #frame, kind, a, b
+
+# Kinds of input record.
+KEY_DOWN = 0 #a = key
+KEY_UP = 1 #a = key
+PLAY_CLICK = 2 #a, b = mouse position
+END = 3 #Frame the recording stopped on.
+
+
+class InputRecorder:
+    """A class to log the game's input, stamped with the frame it arrived on."""
+
+    def __init__(self, path, ai_game):
+        """Open path and write a header that lets the game be rebuilt exactly."""
+        self.ai_game = ai_game
+        self.file = open(path, 'wb')
+        seed = ai_game.seed if ai_game.seed is not None else -1
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, ai_game.settings.screen_width, ai_game.settings.screen_height))
+
+    def log(self, kind, a=0, b=0):
+        """Write one input record for the current frame."""
+        self.file.write(RECORD.pack(self.ai_game.frame, kind, a, b))
+
+    def close(self):
+        """Mark where the recording ended and close the file."""
+        if not self.file.closed:
+            self.log(END)
+            self.file.close()
+
+
+def read_recording(path):
+    """Return (seed, screen size, list of (frame, kind, a, b)) from a recording."""
+    with open(path, 'rb') as file:
+        data = file.read()
+    magic, version, seed, width, height = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not an Alien Invasion recording.")
+    body = data[HEADER.size:]
+    body = body[:len(body) - len(body) % RECORD.size] #Ignore a half-written last record if the game crashed.
+    records = list(RECORD.iter_unpack(body))
+    return (None if seed == -1 else seed), (width, height), records
+
+
+def replay(path, render=False, profile=False):
+    """Play a recording back headless, as fast as possible, and return the game."""
+    from alien_invasion import AlienInvasion
+
+    seed, screen_size, records = read_recording(path)
+    ai_game = AlienInvasion(headless=True, seed=seed, screen_size=screen_size)
+    ai_game.settings.profile_frames = profile
+    end_frame = records[-1][0] if records else 0
+
+    index = 0
+    try:
+        while ai_game.frame <= end_frame:
+            ai_game.profiler.begin_frame()
+            # Feed this frame's input through the same handlers _check_events() uses.
+            while index < len(records) and records[index][0] == ai_game.frame:
+                _, kind, a, b = records[index]
+                index += 1
+                if kind == KEY_DOWN:
+                    ai_game._check_keydown_events(pygame.event.Event(pygame.KEYDOWN, key=a))
+                elif kind == KEY_UP:
+                    ai_game._check_keyup_events(pygame.event.Event(pygame.KEYUP, key=a))
+                elif kind == PLAY_CLICK:
+                    ai_game._check_play_button((a, b))
+                elif kind == END:
+                    return ai_game
+            ai_game.profiler.lap('check_events')
+            ai_game.advance()
+            if render:
+                ai_game._update_screen()
+                ai_game.profiler.lap('update_screen')
+            ai_game.profiler.end_frame()
+    except SystemExit: #The player pressed Q in the recording.
+        pass
+    return ai_game
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Replay a recorded game of Alien Invasion headless.")
+    parser.add_argument('recording', help="file written by alien_invasion.py --record")
+    parser.add_argument('--render', action='store_true', help="draw every frame off-screen as well")
+    parser.add_argument('--profile', metavar='PATH', help="save a frame profile of the replay to PATH (.csv or .json)")
+    args = parser.parse_args()
+
+    start = perf_counter()
+    ai = replay(args.recording, render=args.render, profile=bool(args.profile))
+    elapsed = perf_counter() - start
+    stats = ai.stats
+    print(f"score={stats.score} level={stats.level} ships_left={stats.ships_left} frames={ai.frame} "
+          f"({ai.frame / elapsed:,.0f} frames/s)")
+    if args.profile:
+        ai.profiler.dump(args.profile)
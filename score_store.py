@@ -0,0 +1,159 @@
+import json
+import os
+import queue
+import threading
+import time
+
+
+class ScoreStore:
+    """A class to keep the best scores on disk without slowing down the frame loop.
+
+    Every finished game is appended to a journal. A compacted index holds the
+    top scores per profile and how much of the journal it already covers, so
+    loading only has to replay the journal's tail. Once the journal passes
+    compact_bytes, the index already holds everything in it, so it's emptied.
+    """
+
+    def __init__(self, directory, profile='default', table_size=10, flush_interval=2.0, compact_bytes=64 * 1024):
+        """Initialize the store; nothing is read from disk until it's needed."""
+        self.directory = directory
+        self.profile = profile
+        self.table_size = table_size
+        self.flush_interval = flush_interval #Seconds the writer thread waits to collect a batch of scores.
+        self.compact_bytes = compact_bytes #Journal size at which it's truncated after the index is written.
+        self.journal_path = os.path.join(directory, 'scores.journal')
+        self.index_path = os.path.join(directory, 'scores.index.json')
+
+        self._tables = None #profile -> list of score entries, best first. Loaded lazily.
+        self._journal_offset = 0 #How many bytes of the journal the tables include.
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='score-store', daemon=True)
+        self._writer.start()
+
+    def _load(self):
+        """Read the index, then replay any journal entries written after it."""
+        tables, offset = {}, 0
+        try:
+            with open(self.index_path) as file:
+                index = json.load(file)
+            tables, offset = index['tables'], index['journal_offset']
+        except (OSError, ValueError, KeyError): #No index yet, or an unreadable one: rebuild from the whole journal.
+            tables, offset = {}, 0
+
+        try:
+            with open(self.journal_path, 'rb') as file:
+                if offset > os.fstat(file.fileno()).st_size: #A crash right after compacting: the journal was emptied but the index still counts the old one.
+                    offset = 0
+                file.seek(offset)
+                for line in file:
+                    if not line.endswith(b'\n'): #A crash mid-append leaves a partial last line; skip it.
+                        break
+                    offset += len(line)
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    self._add_to_table(tables, entry)
+        except OSError:
+            pass
+        self._tables, self._journal_offset = tables, offset
+
+    def _ensure_loaded(self):
+        """Load the tables the first time they're needed."""
+        with self._lock:
+            if self._tables is None:
+                self._load()
+
+    def _add_to_table(self, tables, entry):
+        """Put entry in its profile's table, keeping only the best table_size."""
+        table = tables.setdefault(entry['profile'], [])
+        table.append(entry)
+        table.sort(key=lambda item: item['score'], reverse=True)
+        del table[self.table_size:]
+
+    def top_scores(self, profile=None):
+        """Return the best scores for profile (default: this store's profile), best first."""
+        self._ensure_loaded()
+        with self._lock:
+            return list(self._tables.get(profile or self.profile, []))
+
+    def high_score(self):
+        """Return the best score on record for this profile, or 0."""
+        table = self.top_scores()
+        return table[0]['score'] if table else 0
+
+    def loaded_high_score(self):
+        """Return high_score() if the background thread has loaded the tables, or None instead of waiting for it."""
+        if self._tables is None:
+            return None
+        return self.high_score()
+
+    def submit(self, score, level):
+        """Queue a finished game's score; it's written by the background thread."""
+        self._queue.put({'profile': self.profile, 'score': score, 'level': level, 'time': time.time()})
+
+    def _write_loop(self):
+        """Load the tables in the background, then write queued scores to disk in batches."""
+        self._ensure_loaded() #Usually finishes before the game first asks for the high score.
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+            batch = [entry]
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while True: #Collect everything that arrives within flush_interval into one write.
+                try:
+                    entry = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if entry is None:
+                    stop = True
+                    break
+                batch.append(entry)
+            self._write_batch(batch)
+            if stop:
+                break
+
+    def _write_batch(self, batch):
+        """Append batch to the journal, then rewrite the index atomically and compact the journal if it's grown too big."""
+        self._ensure_loaded()
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.journal_path, 'ab') as file:
+            if file.tell() > self._journal_offset: #Drop a partial line left by a crash, so the new entries start on a line of their own.
+                file.truncate(self._journal_offset)
+                file.seek(self._journal_offset)
+            file.write(b''.join(json.dumps(entry).encode() + b'\n' for entry in batch))
+            file.flush()
+            os.fsync(file.fileno()) #The entries are safe on disk before the index claims to include them.
+            offset = file.tell()
+
+        with self._lock: #Only the in-memory update is locked; the game thread's top_scores() never waits on the disk.
+            for entry in batch:
+                self._add_to_table(self._tables, entry)
+            self._journal_offset = offset
+            tables = {profile: list(table) for profile, table in self._tables.items()}
+        self._write_index(tables, offset)
+
+        if offset >= self.compact_bytes: #Everything in the journal is in the index now, so it can start over.
+            with open(self.journal_path, 'r+b') as file:
+                file.truncate(0)
+                os.fsync(file.fileno())
+            with self._lock:
+                self._journal_offset = 0
+            self._write_index(tables, 0) #Until this lands, _load() sees an offset past the end of the journal and reads it from the start.
+
+    def _write_index(self, tables, offset):
+        """Replace the index with tables, covering the journal up to offset."""
+        temp_path = self.index_path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({'tables': tables, 'journal_offset': offset}, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.index_path) #Replacing the file in one step means a crash leaves either the old index or the new one, never half of each.
+
+    def close(self):
+        """Write any queued scores and stop the background thread."""
+        self._queue.put(None)
+        self._writer.join()
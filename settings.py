@@ -1,50 +1,106 @@
-class Settings:
-    """A class to store all settings for Alien Invasion"""
-
-    def __init__(self):
-        """Initialize the game's static settings"""
-        #Screen settings
-        self.screen_width = 1200
-        self.screen_height = 800
-        self.bg_colour = (230, 230, 230)
-
-        #ship settings 
-        self.ship_limit = 3
-
-        #Bullet settings
-        self.bullet_width = 10
-        self.bullet_height = 15
-        self.bullet_color = (60, 60, 60)
-        self.bullets_allowed = 3
-
-        #Alien settings
-        self.fleet_drop_speed = 100 #controls how quickly the fleet drops down the screen each time an alien reaches either edge.
-        # fleet_direction of 1 represents right; -1 represents left. We don’t need to increase the value of fleet_drop_speed, because when the aliens move faster across the screen, they’ll also come down the screen faster
-
-        # How quickly the game speeds up
-        self.speedup_scale = 1.1
-        # How quickly the alien point values increase
-        self.score_scale = 1.5
-
-        self.initialize_dynamic_settings()
-
-    def initialize_dynamic_settings(self):
-        """Initialize settings that change throughout the game.""" #We’ll increase these speeds as the player progresses in the game and reset them each time the player starts a new game. 
-        self.ship_speed = 1 #Initial ship speed is 1.5 pixels. Notice this is a float. rect attributes such as x only store intgers, so we need to modify Ship class
-        self.bullet_speed = 2.5
-        self.alien_speed = 1.0
-
-        # fleet_direction of 1 represents right; -1 represents left.
-        self.fleet_direction = 1
-
-        # Scoring settings
-        self.alien_points = 5000
-
-    def increase_speed(self):
-        """Increase speed settings and alien point values."""
-        self.ship_speed *= self.speedup_scale
-        self.bullet_speed *= self.speedup_scale
-        self.alien_speed *= self.speedup_scale
-
-        self.alien_points = int(self.alien_points * self.score_scale)
-        
+class Settings:
+    """A class to store all settings for Alien Invasion"""
+
+    def __init__(self):
+        """Initialize the game's static settings"""
+        #Screen settings
+        self.screen_width = 1200
+        self.screen_height = 800
+        self.bg_colour = (230, 230, 230)
+        self.dirty_rendering = False #When True, only the parts of the screen that changed are redrawn and pushed to the display each frame. F2 toggles it while playing.
+        self.dirty_max_fraction = 0.5 #While the changed rects cover more than this fraction of the screen, one full redraw is cheaper than all the small ones. A moving fleet covers about 0.4, where rects and a full redraw cost the same even with a free flip.
+
+        #Timing settings
+        self.tick_rate = 60 #Fixed simulation timesteps per second. Speeds below are in pixels per second and get divided down to a timestep with per_tick().
+        self.render_fps_cap = 240 #Most frames drawn per second; 0 draws as fast as possible. Sprites are interpolated between timesteps, so this can be higher than tick_rate.
+        self.max_ticks_per_frame = 5 #After a very slow frame, catch up at most this many timesteps instead of freezing to catch up on all of them.
+        self.interpolate = True #Draw sprites between their last two simulated positions for smooth motion at any frame rate.
+        self.hit_pause = 0.5 #Seconds the game stands still after the ship is hit.
+
+        #Profiling settings
+        self.profile_frames = False #Time each phase of every frame.
+        self.profile_dump_path = None #Where to save the frame profile on exit (.csv or .json).
+        self.show_profiler = False #Draw FPS, frame times and sprite counts on screen. F3 toggles it while playing.
+        self.profiler_overlay_interval = 15 #Frames between overlay updates.
+
+        #Image settings
+        self.ship_image = 'images/ship.bmp'
+        self.alien_image = 'images/alien.bmp'
+        self.use_sprite_atlas = True #Pack the images into one display-format atlas at startup.
+        self.sprite_scale = 1.0 #How much to scale the images; None picks a scale from the screen size.
+        self.sprite_reference_size = (1200, 800) #The screen size the images were drawn for, used when sprite_scale is None.
+        self.sprite_colorkey = None #A colour to treat as transparent in the images, e.g. (230, 230, 230).
+        self.atlas_cache_dir = 'cache' #Where built atlases are saved so later launches can skip building them.
+
+        #ship settings 
+        self.ship_limit = 3
+        self.partner_ship_tint = (120, 200, 255) #Colour multiplied into the other players' ships in a co-op game.
+
+        #High score settings
+        self.persist_scores = True #Keep the best scores on disk between launches (never in headless games).
+        self.score_store_dir = 'scores'
+        self.score_profile = 'default'
+        self.score_table_size = 10 #How many of the best scores to keep per profile.
+
+        #Bullet settings
+        self.bullet_width = 10
+        self.bullet_height = 15
+        self.bullet_color = (60, 60, 60)
+        self.bullets_allowed = 3
+
+        #Alien shot settings
+        self.alien_fire_rates = [0.5, 0.8, 1.2, 1.6, 2.0, 2.5, 3.0] #Shots per second the whole fleet fires at each level. Levels past the end of the list use the last rate.
+        self.alien_shot_speed = 240.0 #Pixels per second, downwards.
+        self.alien_shot_width = 4
+        self.alien_shot_height = 12
+        self.alien_shot_color = (200, 40, 40)
+        self.alien_shot_limit = 256 #Room is made for this many shots in flight at startup; while it's full, aliens hold their fire.
+
+        #Collision settings
+        self.collision_broadphase = 'auto' #'grid' looks up collisions through a spatial hash of the fleet; 'none' uses pygame's pairwise checks; 'auto' uses the grid only for waves of at least collision_grid_min_aliens.
+        self.collision_grid_min_aliens = 40 #Below this, pygame's pairwise check is faster than the grid's lookups (24 aliens at 800x600: 0.008 vs 0.010 ms a tick).
+
+        #Alien settings
+        self.fleet_backend = 'sprites' #'sprites' moves each alien with its own update() call; 'numpy' moves the whole fleet with batched array operations (needs NumPy).
+        self.fleet_formation = 'grid' #'grid', 'staggered', or 'pattern' to read the layout from fleet_pattern_path.
+        self.fleet_pattern_path = 'fleet_pattern.txt' #One line per row; any character except a space or '.' is an alien.
+        self.fleet_drop_speed = 100 #controls how quickly the fleet drops down the screen each time an alien reaches either edge.
+        self.waves_path = None #A JSON file of waves, each with several fleets of different alien types (see waves.py and waves.json). None plays one classic fleet per level.
+        # fleet_direction of 1 represents right; -1 represents left. We don’t need to increase the value of fleet_drop_speed, because when the aliens move faster across the screen, they’ll also come down the screen faster
+
+        # How quickly the game speeds up
+        self.speedup_scale = 1.1
+        # How quickly the alien point values increase
+        self.score_scale = 1.5
+
+        self.initialize_dynamic_settings()
+
+    def initialize_dynamic_settings(self):
+        """Initialize settings that change throughout the game.""" #We’ll increase these speeds as the player progresses in the game and reset them each time the player starts a new game. 
+        self.ship_speed = 60.0 #Initial ship speed is 60 pixels per second. Notice this is a float. rect attributes such as x only store intgers, so we need to modify Ship class
+        self.bullet_speed = 150.0 #Pixels per second.
+        self.alien_speed = 60.0 #Pixels per second.
+
+        # fleet_direction of 1 represents right; -1 represents left. Each fleet starts out this way and then keeps its own direction.
+        self.fleet_direction = 1
+
+        # Scoring settings
+        self.alien_points = 5000
+
+    def per_tick(self, speed):
+        """Return how far something moving at speed (pixels per second) moves in one timestep."""
+        return speed / self.tick_rate
+
+    def alien_fire_rate(self, level):
+        """Return how many shots per second the aliens fire at level."""
+        rates = self.alien_fire_rates
+        return rates[min(level, len(rates)) - 1] if rates else 0.0
+
+    def increase_speed(self):
+        """Increase speed settings and alien point values."""
+        self.ship_speed *= self.speedup_scale
+        self.bullet_speed *= self.speedup_scale
+        self.alien_speed *= self.speedup_scale
+
+        self.alien_points = int(self.alien_points * self.score_scale)
+        
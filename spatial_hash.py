@@ -0,0 +1,136 @@
+class SpatialHash:
+    """A uniform grid that finds which sprites might overlap a rect without checking them all.
+
+    Every alien in a fleet moves by the same amount, so each fleet is indexed
+    in its own coordinates: where its aliens were when they were added. A rect
+    is looked up by moving it back by how far the fleet has gone since, which
+    one sprite of the fleet (its anchor) tells us. Nothing is re-bucketed as
+    the fleets move.
+
+    The grid doesn't watch the group: every sprite has to be added and removed
+    through insert(), remove(), rebuild() or groupcollide().
+    """
+
+    def __init__(self, cell_width, cell_height):
+        """Initialize an empty grid with cells of the given size."""
+        self.cell_width = cell_width #Cells are sized from the alien rect, so each alien covers at most four cells.
+        self.cell_height = cell_height
+        self.cells = {} #Maps each fleet to a dict of (column, row) -> the set of its sprites touching that cell.
+        self.spans = {} #Maps each sprite to the block of cells it covers, in its fleet's coordinates.
+        self.origins = {} #Maps each sprite to its rect's topleft in its fleet's coordinates.
+        self.members = {} #Maps each fleet to the set of its sprites in the grid.
+        self.anchors = {} #Maps each fleet to the sprite whose rect tells how far the fleet has moved.
+        self.order = {} #Maps each sprite to the order it was added in, so results come back in group order just like pygame.sprite.groupcollide().
+        self._next_order = 0
+
+    def _span(self, left, top, right, bottom):
+        """Return the (first column, first row, last column, last row) of cells the box covers."""
+        return (left // self.cell_width, top // self.cell_height,
+                (right - 1) // self.cell_width, (bottom - 1) // self.cell_height)
+
+    def _offset(self, fleet):
+        """Return how far fleet has moved since its sprites were added, as (x, y)."""
+        anchor = self.anchors.get(fleet)
+        if anchor is None:
+            members = self.members.get(fleet)
+            if not members:
+                return 0, 0
+            anchor = self.anchors[fleet] = next(iter(members)) #The old anchor was removed; any sprite of the fleet will do.
+        x, y = self.origins[anchor]
+        return anchor.rect.x - x, anchor.rect.y - y
+
+    def insert(self, sprite):
+        """Add sprite to the grid."""
+        fleet = sprite.fleet
+        dx, dy = self._offset(fleet)
+        rect = sprite.rect
+        left, top = rect.x - dx, rect.y - dy
+        span = self._span(left, top, left + rect.width, top + rect.height)
+        self.spans[sprite] = span
+        self.origins[sprite] = left, top
+        self.members.setdefault(fleet, set()).add(sprite)
+        self.anchors.setdefault(fleet, sprite)
+        self.order[sprite] = self._next_order
+        self._next_order += 1
+
+        cells = self.cells.setdefault(fleet, {})
+        first_column, first_row, last_column, last_row = span
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cells.setdefault((column, row), set()).add(sprite)
+
+    def remove(self, sprite):
+        """Remove sprite from the grid if it's there."""
+        span = self.spans.pop(sprite, None)
+        if span is None:
+            return
+        fleet = sprite.fleet
+        del self.order[sprite]
+        del self.origins[sprite]
+        members = self.members[fleet]
+        members.discard(sprite)
+        if self.anchors.get(fleet) is sprite:
+            del self.anchors[fleet] #_offset() picks a new one when it's next needed.
+
+        cells = self.cells[fleet]
+        first_column, first_row, last_column, last_row = span
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = cells.get((column, row))
+                if cell is not None:
+                    cell.discard(sprite)
+                    if not cell:
+                        del cells[(column, row)]
+        if not members: #The fleet has been shot down.
+            del self.members[fleet]
+            del self.cells[fleet]
+
+    def rebuild(self, group):
+        """Empty the grid and index every sprite in group, in group order."""
+        self.cells.clear()
+        self.spans.clear()
+        self.origins.clear()
+        self.members.clear()
+        self.anchors.clear()
+        self.order.clear()
+        self._next_order = 0
+        for sprite in group:
+            self.insert(sprite)
+
+    def query(self, rect):
+        """Return the sprites whose rect overlaps rect, in the order they were added."""
+        candidates = set()
+        for fleet, cells in self.cells.items():
+            dx, dy = self._offset(fleet)
+            left, top = rect.x - dx, rect.y - dy
+            # One pixel of slack each way: each alien rounds its own float position, so it can be a pixel off its fleet's offset.
+            first_column, first_row, last_column, last_row = self._span(left - 1, top - 1, left + rect.width + 1, top + rect.height + 1)
+            for column in range(first_column, last_column + 1):
+                for row in range(first_row, last_row + 1):
+                    cell = cells.get((column, row))
+                    if cell:
+                        candidates.update(cell)
+        hits = [sprite for sprite in candidates if rect.colliderect(sprite.rect)]
+        hits.sort(key=self.order.__getitem__)
+        return hits
+
+    def groupcollide(self, group, dokill, dokill_indexed):
+        """Work like pygame.sprite.groupcollide(group, indexed_group, ...) using the grid."""
+        collisions = {}
+        for sprite in group.sprites():
+            hits = self.query(sprite.rect)
+            if not hits:
+                continue
+            if dokill_indexed:
+                for hit in hits:
+                    hit.kill()
+                    self.remove(hit) #Removing it right away means a later bullet in the same frame can't hit the same alien, as in pygame.
+            collisions[sprite] = hits
+            if dokill:
+                sprite.kill()
+        return collisions
+
+    def spritecollideany(self, sprite):
+        """Work like pygame.sprite.spritecollideany(sprite, indexed_group) using the grid."""
+        hits = self.query(sprite.rect)
+        return hits[0] if hits else None
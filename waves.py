@@ -0,0 +1,141 @@
+import json
+
+from pygame.sprite import Group
+
+from fleet_layout import fleet_layout
+
+
+class Fleet:
+    """A class to hold one fleet's aliens and the way they move together."""
+
+    def __init__(self, ai_game, kind, image, speed, direction, drop_speed, points):
+        """Initialize an empty fleet; the scheduler adds its aliens."""
+        self.settings = ai_game.settings
+        self.kind = kind #Name of the alien type, from the waves file.
+        self.image = image
+        self.speed = speed #Pixels per second.
+        self.direction = direction #1 is right, -1 is left.
+        self.drop_speed = drop_speed #Pixels the fleet drops each time it reaches an edge.
+        self.points = points #Score for each alien shot down.
+        self.aliens = Group() #Aliens also belong to the game's aliens group; killing one takes it out of both.
+
+    def __bool__(self):
+        """Return True while the fleet has aliens left."""
+        return bool(self.aliens)
+
+    @property
+    def velocity(self):
+        """Return how far the fleet moves sideways in one timestep."""
+        return self.settings.per_tick(self.speed) * self.direction
+
+    def change_direction(self):
+        """Drop the fleet and change its direction."""
+        for alien in self.aliens.sprites():
+            alien.rect.y += self.drop_speed
+        self.direction *= -1
+
+
+class WaveScheduler:
+    """A class to load wave definitions and spawn each wave's fleets on time.
+
+    The waves file is JSON. "types" names the kinds of alien, and "waves" lists
+    the waves, used in turn for each level. Each wave is a list of fleets:
+
+        {"types": {"scout": {"image": "images/alien.bmp", "speed": 1.5, "points": 2}},
+         "waves": [{"fleets": [{"type": "scout", "area": [0, 0, 1, 0.5], "direction": -1,
+                                "formation": "staggered", "delay": 2.0}]}]}
+
+    A fleet's speed and points multiply the level's alien_speed and
+    alien_points, so the difficulty still ramps up; a fleet can override its
+    type's values. area is the part of the screen the fleet is laid out in, as
+    fractions of the screen (x, y, width, height). delay is seconds after the
+    wave starts before the fleet arrives. Anything left out comes from Settings.
+    """
+
+    def __init__(self, ai_game):
+        """Load the wave definitions from settings.waves_path, or make one wave like the classic fleet."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        if self.settings.waves_path:
+            with open(self.settings.waves_path) as file:
+                data = json.load(file)
+        else:
+            data = {'types': {'alien': {}}, 'waves': [{'fleets': [{'type': 'alien'}]}]}
+        self.types = data.get('types', {})
+        self.waves = data['waves']
+        for wave in self.waves:
+            for spec in wave['fleets']:
+                if spec.get('type', 'alien') not in self.types:
+                    raise ValueError(f"Unknown alien type {spec.get('type', 'alien')!r} in {self.settings.waves_path}.")
+        if not self.waves:
+            raise ValueError(f"{self.settings.waves_path} has no waves.")
+
+        self.fleets = [] #Fleets on screen, in the order they arrived.
+        self.pending = [] #(timestep, fleet definition) for fleets still to arrive this wave, soonest first.
+        self.ticks = 0 #Timesteps since the wave started.
+
+    def image_paths(self):
+        """Return every alien image the waves use, so they can be loaded up front."""
+        paths = [self.settings.alien_image]
+        for alien_type in self.types.values():
+            path = alien_type.get('image', self.settings.alien_image)
+            if path not in paths:
+                paths.append(path)
+        for wave in self.waves: #A fleet can override its type's image too.
+            for spec in wave['fleets']:
+                path = spec.get('image')
+                if path is not None and path not in paths:
+                    paths.append(path)
+        return paths
+
+    def _value(self, spec, name, default):
+        """Return a fleet's value for name, falling back to its type's and then to default."""
+        return spec.get(name, self.types[spec.get('type', 'alien')].get(name, default))
+
+    def start(self, level):
+        """Begin the wave for level; fleets with no delay arrive right away."""
+        wave = self.waves[(level - 1) % len(self.waves)] #Run out of waves and they start again, faster.
+        self.fleets = []
+        self.ticks = 0
+        self.pending = sorted(((round(spec.get('delay', 0) * self.settings.tick_rate), spec) for spec in wave['fleets']),
+                              key=lambda item: item[0]) #Fleets due at the same time keep the file's order.
+        self.spawn_due()
+
+    def update(self):
+        """Count a timestep and spawn any fleets now due; return True if one arrived."""
+        self.ticks += 1
+        if not all(self.fleets): #Forget fleets that have been shot down.
+            self.fleets = [fleet for fleet in self.fleets if fleet]
+        return self.spawn_due()
+
+    def spawn_due(self):
+        """Spawn every pending fleet whose time has come; return True if any did."""
+        spawned = False
+        while self.pending and self.pending[0][0] <= self.ticks:
+            self._spawn(self.pending.pop(0)[1])
+            spawned = True
+        return spawned
+
+    def _spawn(self, spec):
+        """Build one fleet from its definition and add its aliens to the game."""
+        ai_game = self.ai_game
+        settings = self.settings
+        image = ai_game.assets.load_image(self._value(spec, 'image', settings.alien_image))
+        fleet = Fleet(ai_game, spec.get('type', 'alien'), image,
+                      speed=settings.alien_speed * self._value(spec, 'speed', 1.0),
+                      direction=self._value(spec, 'direction', settings.fleet_direction),
+                      drop_speed=self._value(spec, 'drop_speed', settings.fleet_drop_speed),
+                      points=int(settings.alien_points * self._value(spec, 'points', 1)))
+
+        area = None
+        if 'area' in spec:
+            left, top, width, height = spec['area']
+            area = (round(left * settings.screen_width), round(top * settings.screen_height),
+                    round(width * settings.screen_width), round(height * settings.screen_height))
+        rows = fleet_layout(settings, image.get_size(), self._value(spec, 'formation', None),
+                            self._value(spec, 'pattern_path', None), area)
+        for row in rows:
+            aliens = [ai_game.alien_pool.acquire(x, y, fleet) for x, y in row]
+            ai_game.aliens.add(aliens) #Add a whole row to the groups in one call.
+            fleet.aliens.add(aliens)
+        self.fleets.append(fleet)